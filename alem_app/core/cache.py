@@ -60,37 +60,51 @@ class RedisCacheManager:
             return 0
 
     def flush_to_db(self, db: 'Database') -> Tuple[int, int]:
-        """Flush dirty notes back to SQLite. Returns (flushed, errors).""" 
+        """Flush dirty notes back to SQLite. Returns (flushed, errors).
+
+        Safe to call from a worker thread: redis-py clients are thread-safe and the
+        database opens its own connection per call.
+        """
         if not (self.enabled and self._connected):
             return (0, 0)
-        flushed = 0
-        errors = 0
         try:
-            ids = list(self.client.smembers(self._dirty_key))
-            for sid in ids:
+            ids = []
+            for sid in self.client.smembers(self._dirty_key):
                 try:
-                    nid = int(sid)
+                    ids.append(int(sid))
                 except ValueError:
                     continue
-                data = self.client.hgetall(self.key_for(nid))
-                if not data:
-                    self.client.srem(self._dirty_key, nid)
-                    continue
-                # Normalize types
-                note = Note.from_dict({
-                    'id': int(data.get('id', nid)),
-                    'title': data.get('title', ''),
-                    'content': data.get('content', ''),
-                    'tags': data.get('tags', ''),
-                    'created_at': data.get('created_at'),
-                    'updated_at': data.get('updated_at'),
-                    'locked': str(data.get('locked', '0')) in ('1', 'True', 'true'),
-                    'content_format': data.get('content_format', 'html')
-                })
-                db.save_note(note)
-                self.client.srem(self._dirty_key, nid)
-                flushed += 1
+            if not ids:
+                return (0, 0)
+            # Read every dirty note and clear its flag in one atomic round-trip;
+            # saves landing after this point re-mark their note for the next flush
+            pipe = self.client.pipeline(transaction=True)
+            for nid in ids:
+                pipe.hgetall(self.key_for(nid))
+            pipe.srem(self._dirty_key, *ids)
+            results = pipe.execute()[:-1]
+            notes = [self._note_from_cache(nid, data) for nid, data in zip(ids, results) if data]
+            try:
+                db.save_notes(notes)
+            except Exception:
+                if notes:
+                    self.client.sadd(self._dirty_key, *[note.id for note in notes])
+                raise
+            return (len(notes), 0)
         except Exception as e:
             logger.error(f"Redis flush error: {e}")
-            errors += 1
-        return (flushed, errors)
+            return (0, 1)
+
+    @staticmethod
+    def _note_from_cache(nid: int, data: Dict) -> 'Note':
+        # Normalize types
+        return Note.from_dict({
+            'id': int(data.get('id', nid)),
+            'title': data.get('title', ''),
+            'content': data.get('content', ''),
+            'tags': data.get('tags', ''),
+            'created_at': data.get('created_at'),
+            'updated_at': data.get('updated_at'),
+            'locked': str(data.get('locked', '0')) in ('1', 'True', 'true'),
+            'content_format': data.get('content_format', 'html')
+        })
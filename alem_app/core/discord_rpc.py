@@ -30,7 +30,8 @@ class DiscordRPCManager:
         if not self.enabled or self.rpc is None:
             return
         try:
-            buttons = app_config.get('discord_buttons', []) if app_config else []
+            # Defaults are read-only mappings; pypresence wants plain dicts
+            buttons = [dict(b) for b in app_config.get('discord_buttons', ())] if app_config else []
             logger.debug(f"Updating Discord RPC (buttons={buttons})")
             self.rpc.update(
                 state=state,
@@ -0,0 +1,57 @@
+from typing import Callable, Optional, Set
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class WorkerSignals(QObject):
+    progress = pyqtSignal(object)
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+    done = pyqtSignal()
+
+
+class FunctionWorker(QRunnable):
+    """Runs a blocking callable on the global QThreadPool and reports back via signals."""
+
+    def __init__(self, fn: Callable, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+        finally:
+            self.signals.done.emit()
+
+
+# Keep workers (and their signal objects) alive until their results are delivered
+_active_workers: Set[FunctionWorker] = set()
+
+
+def run_in_pool(fn: Callable, *args, on_finished: Optional[Callable] = None,
+                on_error: Optional[Callable] = None, on_progress: Optional[Callable] = None,
+                **kwargs) -> FunctionWorker:
+    """Start fn(*args, **kwargs) on the global thread pool; callbacks run on the UI thread.
+
+    When on_progress is given, fn receives a progress_callback keyword it can call
+    with partial results.
+    """
+    worker = FunctionWorker(fn, *args, **kwargs)
+    if on_progress:
+        worker.kwargs['progress_callback'] = worker.signals.progress.emit
+        worker.signals.progress.connect(on_progress)
+    if on_finished:
+        worker.signals.finished.connect(on_finished)
+    if on_error:
+        worker.signals.error.connect(on_error)
+    _active_workers.add(worker)
+    worker.signals.done.connect(lambda: _active_workers.discard(worker))
+    QThreadPool.globalInstance().start(worker)
+    return worker
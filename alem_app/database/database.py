@@ -2,7 +2,7 @@
 import sqlite3
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
 from PyQt6.QtCore import QStandardPaths
 
@@ -113,6 +113,25 @@ class Database:
         finally:
             conn.close()
 
+    def iter_note_header_batches(self, batch_size: int = 50) -> Iterator[List[Note]]:
+        """Yield note headers in batches so callers can populate lists incrementally"""
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, title, tags, created_at, updated_at FROM notes ORDER BY updated_at DESC")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [Note(id=row[0], title=row[1], content="", tags=row[2],
+                            created_at=row[3], updated_at=row[4]) for row in rows]
+        except sqlite3.Error as e:
+            logger.error(f"Error fetching note headers: {e}")
+        finally:
+            if conn:
+                conn.close()
+
     def get_note(self, note_id: int) -> Optional[Note]:
         """Fetch the full content for ONE note when needed"""
         try:
@@ -164,6 +183,28 @@ class Database:
         finally:
             conn.close()
 
+    def save_notes(self, notes: List[Note]) -> int:
+        """Write many existing notes back in a single transaction"""
+        if not notes:
+            return 0
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_path)
+            now = datetime.now().isoformat()
+            conn.executemany("""
+                UPDATE notes SET title = ?, content = ?, tags = ?, updated_at = ?, locked = ?, content_format = ?
+                WHERE id = ?
+            """, [(note.title, note.content, note.tags, now, int(note.locked), note.content_format, note.id)
+                  for note in notes])
+            conn.commit()
+            return len(notes)
+        except sqlite3.Error as e:
+            logger.error(f"Error saving notes: {e}")
+            raise
+        finally:
+            if conn:
+                conn.close()
+
     def delete_note(self, note_id: int) -> bool:
         """Delete note with error handling"""
         try:
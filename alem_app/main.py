@@ -15,6 +15,12 @@ def main():
     import sys
     from PyQt6.QtCore import QSettings
     
+    # Diagnostics for the launcher/installer: the key classes imported, so report and exit before any UI
+    if "--self-check" in sys.argv:
+        from alem_app.database.database import Database
+        print(f"[OK] {SmartNotesApp.__name__} and {Database.__name__} available")
+        sys.exit(0)
+    
     # Set up application with enhanced properties
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
@@ -87,7 +87,7 @@ def create_menu_bar(main_window):
 
     main_window.action_refresh_preview = QAction('Refresh Preview', main_window)
     main_window.action_refresh_preview.setShortcut('F5')
-    main_window.action_refresh_preview.triggered.connect(main_window.render_preview)
+    main_window.action_refresh_preview.triggered.connect(lambda: main_window.render_preview(force=True))
     view_menu.addAction(main_window.action_refresh_preview)
 
     # Help menu
@@ -1,11 +1,15 @@
 
+import copy
+import json
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from PyQt6.QtCore import Qt, QTimer, QSize
-from PyQt6.QtGui import QIcon, QFont, QKeySequence, QTextCharFormat, QAction
+from PyQt6.QtCore import Qt, QTimer, QSize, QSignalBlocker
+from PyQt6.QtGui import QIcon, QFont, QKeySequence, QTextCharFormat, QAction, QTextDocument
 from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QSplitter, QLabel, QStatusBar, QProgressBar, QMessageBox, QListWidgetItem, QDialog, QLineEdit, QListWidget, QDialogButtonBox, QFormLayout, QApplication, QInputDialog, QFrame
 
 from alem_app.core.cache import RedisCacheManager
@@ -13,26 +17,109 @@ from alem_app.core.discord_rpc import DiscordRPCManager
 from alem_app.database.database import Database, Note
 from alem_app.ui.actions import create_menu_bar, setup_shortcuts
 from alem_app.ui.left_panel import create_left_panel
-from alem_app.ui.right_panel import create_right_panel
+from alem_app.ui.right_panel import create_right_panel, create_preview_view
 from alem_app.ui.settings_dialog import SettingsDialog
-from alem_app.utils.encryption import decrypt_content, encrypt_content
+from alem_app.utils.encryption import clear_key_cache, decrypt_content, encrypt_content, encryption_available
 from alem_app.utils.logging import logger
 from config import config as app_config
 from alem_app.core.suggestion_engine import SuggestionEngine
+from alem_app.core.workers import run_in_pool
 from alem_app.ui.ghost_text_overlay import GhostTextOverlay
 from alem_app.ui.inline_edit_bar import InlineEditBar
 from alem_app.ui.command_palette import CommandPalette
 
-try:
-    import markdown as md
-except ImportError:
-    md = None
+# Heavy optional modules are imported on first use: None = not tried yet, False = unavailable
+_md_module = None
 
-try:
-    from cryptography.fernet import Fernet, InvalidToken
-except ImportError:
-    Fernet = None
-    InvalidToken = None
+
+def _get_md():
+    """Return the markdown module, importing it on first call"""
+    global _md_module
+    if _md_module is None:
+        try:
+            import markdown
+            _md_module = markdown
+        except ImportError:
+            _md_module = False
+    return _md_module or None
+
+
+def _set_enabled(widget, enabled: bool):
+    """setEnabled that skips the call (and its change events) when nothing changes"""
+    if widget.isEnabled() != enabled:
+        widget.setEnabled(enabled)
+
+
+def _set_checked(widget, checked: bool):
+    """setChecked that skips the call (and its toggled signal) when nothing changes"""
+    if widget.isChecked() != checked:
+        widget.setChecked(checked)
+
+# Styled document loaded once into the web preview; renders only replace its body
+_PREVIEW_SHELL = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <style>
+        body {
+            background: rgba(15, 23, 42, 0.9);
+            color: #f1f5f9;
+            font-family: 'Segoe UI', system-ui, sans-serif;
+            line-height: 1.6;
+            padding: 24px;
+            margin: 0;
+        }
+        h1, h2, h3, h4, h5, h6 {
+            color: #93c5fd;
+            margin-top: 1.5em;
+            margin-bottom: 0.5em;
+            font-weight: 600;
+        }
+        h1 { font-size: 2em; border-bottom: 2px solid rgba(59, 130, 246, 0.3); padding-bottom: 0.3em; }
+        h2 { font-size: 1.6em; border-bottom: 1px solid rgba(59, 130, 246, 0.2); padding-bottom: 0.2em; }
+        p { margin-bottom: 1em; }
+        a {
+            color: #60a5fa;
+            text-decoration: none;
+            border-bottom: 1px solid rgba(96, 165, 250, 0.3);
+        }
+        a:hover {
+            color: #93c5fd;
+            border-bottom-color: rgba(147, 197, 253, 0.6);
+        }
+        code {
+            background: rgba(30, 41, 59, 0.8);
+            color: #fbbf24;
+            padding: 2px 6px;
+            border-radius: 4px;
+            font-family: 'Consolas', 'Monaco', monospace;
+            font-size: 0.9em;
+        }
+        pre {
+            background: rgba(30, 41, 59, 0.8);
+            border: 1px solid rgba(51, 65, 85, 0.3);
+            border-radius: 8px;
+            padding: 16px;
+            overflow-x: auto;
+            margin: 1em 0;
+        }
+        pre code {
+            background: transparent;
+            padding: 0;
+            color: #e2e8f0;
+        }
+    </style>
+</head>
+<body id="content"></body>
+</html>
+"""
+
+# Notes list rows delivered per batch while loading headers in the background
+_NOTE_HEADER_BATCH_SIZE = 50
+
+# Number of recently rendered markdown documents kept for instant re-renders
+_MARKDOWN_CACHE_SIZE = 8
 
 
 class SmartNotesApp(QMainWindow):
@@ -49,10 +136,47 @@ class SmartNotesApp(QMainWindow):
         self.search_timer.timeout.connect(self._perform_delayed_search)
         self.last_search_query = ""
         self.last_search_time = 0
-
-        self.preview_timer = QTimer()
-        self.preview_timer.setSingleShot(True)
-        self.preview_timer.timeout.connect(self.render_preview)
+        self._search_token = 0
+        # Bumped on every note switch so late decrypt results can be dropped
+        self._load_token = 0
+        # Load token of the note whose unlock is still decrypting on the pool, if any
+        self._unlock_token = None
+        self._flush_in_progress = False
+        # Set by the pool thread when a periodic flush finishes; closeEvent waits on it
+        self._flush_done = threading.Event()
+        # Last (bold, italic, underline) pushed to the toolbar; None forces a refresh
+        self._last_fmt_sig = None
+        self._stats_cache = None
+        self._stats_dirty = True
+
+        self._md = None  # built on first markdown render
+        self._md_cache = OrderedDict()
+        self._preview_shell_state = None  # None, 'loading' or 'ready'
+        self._last_preview_key = None
+        # Edits only mark the preview dirty; it is rendered when its tab is shown
+        self._preview_dirty = True
+        self._preview_visible = False
+        self._pending_preview_body = None
+        self._last_preview_html = None  # body currently shown in the web preview shell
+
+        # Word count is recomputed only once typing goes idle
+        self._word_cache = 0
+        self.word_count_timer = QTimer()
+        self.word_count_timer.setSingleShot(True)
+        self.word_count_timer.timeout.connect(self._recount_words)
+
+        # A window drag fires resizeEvent per pixel; relayout once it settles
+        self._resize_timer = QTimer()
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(60)
+        self._resize_timer.timeout.connect(self._apply_splitter_sizes)
+
+        # Editor/title/tags edits land here first; the real handler runs once typing pauses briefly
+        self._content_dirty_timer = QTimer()
+        self._content_dirty_timer.setSingleShot(True)
+        self._content_dirty_timer.setInterval(50)
+        self._content_dirty_timer.timeout.connect(self.on_content_changed)
+        self._splitter_bucket = None  # (breakpoint, sidebar width) last applied
 
         self.setWindowTitle("Alem - Smart Notes")
         self.setGeometry(100, 100, 1400, 900)
@@ -79,8 +203,10 @@ class SmartNotesApp(QMainWindow):
         ctrl_p = QShortcut(QKeySequence("Ctrl+P"), self)
         ctrl_p.activated.connect(self.command_palette.show_palette)
 
-        self.load_note_headers()
+        # Let the window paint before the notes list starts filling in
+        QTimer.singleShot(0, self.load_note_headers)
         self.update_stats()
+        self.update_cache_status()
         
         # Initial preview render
         QTimer.singleShot(100, self.render_preview)  # Delay to ensure UI is fully loaded
@@ -90,10 +216,8 @@ class SmartNotesApp(QMainWindow):
         self.auto_save_timer.timeout.connect(self.auto_save)
         self.redis_flush_timer = QTimer()
         self.redis_flush_timer.timeout.connect(self.flush_cache_periodic)
-        self.analytics_timer = QTimer()
-        self.analytics_timer.timeout.connect(self.update_analytics)
         self.restart_timers()
-        self.analytics_timer.start(1000)
+        # Analytics are refreshed by the events that change them; no polling timer
 
     def setup_ui(self):
         self.setStyleSheet(
@@ -207,21 +331,62 @@ class SmartNotesApp(QMainWindow):
             self.status_bar.showMessage(message, int(timeout_ms))
 
     def load_note_headers(self):
-        note_headers = self.db.get_all_note_headers()
-        self.refresh_notes_list(note_headers)
+        # Headers stream in from a worker thread; the first batch replaces the list
+        self._search_token += 1
+        token = self._search_token
+        state = {'received': False}
+
+        def on_batch(batch):
+            if token != self._search_token:
+                return
+            if state['received']:
+                self._append_note_items(batch)
+            else:
+                state['received'] = True
+                self.refresh_notes_list(batch)
+
+        def on_done(_result):
+            if token == self._search_token and not state['received']:
+                self.refresh_notes_list([])
+
+        run_in_pool(self._fetch_note_header_batches, on_progress=on_batch, on_finished=on_done)
+
+    def _fetch_note_header_batches(self, progress_callback):
+        for batch in self.db.iter_note_header_batches(_NOTE_HEADER_BATCH_SIZE):
+            progress_callback(batch)
 
     def refresh_notes_list(self, note_headers: list[Note]):
-        self.notes_list.clear()
-        for note in note_headers:
-            item_text = f"{note.title}"
-            if note.tags:
-                item_text += f"  •  #{note.tags.replace(',', ' #')}"
-            item = QListWidgetItem(item_text)
-            item.setData(Qt.ItemDataRole.UserRole, note.id)
-            item.setToolTip(f"Tags: {note.tags}\nCreated: {note.created_at[:10]}")
-            self.notes_list.addItem(item)
+        self._append_note_items(note_headers, replace=True)
         self.update_stats()
 
+    @staticmethod
+    def _note_item_rows(note_headers: list[Note]) -> list[tuple]:
+        rows = []
+        for note in note_headers:
+            item_text = f"{note.title}  •  #{note.tags.replace(',', ' #')}" if note.tags else note.title
+            tooltip = f"Tags: {note.tags}\nCreated: {note.created_at[:10]}"
+            rows.append((item_text, note.id, note.title, tooltip))
+        return rows
+
+    def _append_note_items(self, note_headers: list[Note], replace: bool = False):
+        # Build all strings first so the blocked section below only touches Qt
+        rows = self._note_item_rows(note_headers)
+        # Add without intermediate repaints/signals; one layout pass at the end
+        self.notes_list.setUpdatesEnabled(False)
+        self.notes_list.blockSignals(True)
+        try:
+            if replace:
+                self.notes_list.clear()
+            for item_text, note_id, title, tooltip in rows:
+                item = QListWidgetItem(item_text)
+                item.setData(Qt.ItemDataRole.UserRole, note_id)
+                item.setData(Qt.ItemDataRole.UserRole + 1, title)
+                item.setToolTip(tooltip)
+                self.notes_list.addItem(item)
+        finally:
+            self.notes_list.blockSignals(False)
+            self.notes_list.setUpdatesEnabled(True)
+
     def load_selected_note(self, item: QListWidgetItem):
         note_id = item.data(Qt.ItemDataRole.UserRole)
         note = None
@@ -238,6 +403,7 @@ class SmartNotesApp(QMainWindow):
                 self.redis_cache.cache_note(note)
 
         if note:
+            token = self._begin_load()
             self.current_note = note
             self.title_input.setText(note.title)
             self.tags_input.setText(note.tags)
@@ -245,27 +411,67 @@ class SmartNotesApp(QMainWindow):
             if note.locked:
                 pwd = self.prompt_password("Unlock Note", "Enter password to unlock this note:")
                 if pwd:
-                    try:
-                        content_text = decrypt_content(content_text, pwd)
-                    except (ValueError, InvalidToken):
-                        QMessageBox.critical(self, "Error", "Incorrect password or decryption failed.")
-                        content_text = ""
-                else:
-                    content_text = ""
+                    # Key derivation is slow; decrypt on the pool and fill the editor when done
+                    self._show_note_content(note, "", status=f"Unlocking '{note.title}'...")
+                    # Nothing typed now could be saved correctly; keep the editor frozen until the result lands
+                    self._unlock_token = token
+                    self.content_editor.setReadOnly(True)
+                    self.operation_progress.setVisible(True)
+                    self.operation_progress.setRange(0, 0)
+                    run_in_pool(
+                        decrypt_content, content_text, pwd,
+                        on_finished=lambda text: self._on_note_decrypted(token, note, text),
+                        on_error=lambda err: self._on_note_decrypt_error(token, note),
+                    )
+                    return
+                content_text = ""
+
+            self._show_note_content(note, content_text)
+
+    def _begin_load(self) -> int:
+        """Start a new note load, dropping any unlock still in flight; returns its token"""
+        self._load_token += 1
+        self._unlock_token = None
+        self.content_editor.setReadOnly(False)
+        return self._load_token
+
+    def _unlock_pending(self) -> bool:
+        return self._unlock_token is not None and self._unlock_token == self._load_token
+
+    def _show_note_content(self, note: Note, content_text: str, status: Optional[str] = None):
+        self.format_combo.setCurrentText(note.content_format.upper())
+        if note.content_format == 'html':
+            self.content_editor.setHtml(content_text)
+        else:
+            self.content_editor.setPlainText(content_text)
+        # Filling the editor is not an edit; drop the pending change notification
+        self._content_dirty_timer.stop()
 
-            self.format_combo.setCurrentText(note.content_format.upper())
-            if note.content_format == 'html':
-                self.content_editor.setHtml(content_text)
-            else:
-                self.content_editor.setPlainText(content_text)
+        _set_enabled(self.save_btn, False)
+        self.set_status(status or f"Loaded: '{note.title}'")
+        self.render_preview()
+        self._recount_words()
 
-            self.save_btn.setEnabled(False)
-            self.set_status(f"Loaded: '{note.title}'")
-            self.render_preview()
-            self.update_analytics()
+    def _on_note_decrypted(self, token: int, note: Note, content_text: str):
+        if token != self._load_token:
+            return
+        self._unlock_token = None
+        self.content_editor.setReadOnly(False)
+        self.operation_progress.setVisible(False)
+        self._show_note_content(note, content_text)
+
+    def _on_note_decrypt_error(self, token: int, note: Note):
+        if token != self._load_token:
+            return
+        self._unlock_token = None
+        self.content_editor.setReadOnly(False)
+        self.operation_progress.setVisible(False)
+        QMessageBox.critical(self, "Error", "Incorrect password or decryption failed.")
+        self._show_note_content(note, "")
 
     def new_note(self):
         default_fmt = (app_config.get('default_content_format', 'markdown') if app_config else 'markdown')
+        self._begin_load()
         self.current_note = Note(title="New Note", content="", content_format=default_fmt)
         self.title_input.setText(self.current_note.title)
         self.tags_input.setText("")
@@ -273,13 +479,16 @@ class SmartNotesApp(QMainWindow):
         self.format_combo.setCurrentText(default_fmt.capitalize())
         self.title_input.setFocus()
         self.title_input.selectAll()
-        self.save_btn.setEnabled(True)
+        _set_enabled(self.save_btn, True)
         self.notes_list.setCurrentItem(None)
         self.render_preview()
-        self.update_analytics()
+        self._recount_words()
 
     def save_note(self):
         if not self.current_note: return
+        if self._unlock_pending():
+            self.set_status("Still unlocking note...", 2000)
+            return
 
         self.current_note.title = self.title_input.text().strip() or "Untitled"
         self.current_note.content_format = self.format_combo.currentText().lower()
@@ -300,7 +509,7 @@ class SmartNotesApp(QMainWindow):
             try:
                 iters = app_config.get('kdf_iterations', 390000) if app_config else 390000
                 enc_content = encrypt_content(self.current_note.content, pwd, iters)
-                note_to_save = Note(**self.current_note.to_dict())
+                note_to_save = copy.copy(self.current_note)
                 note_to_save.content = enc_content
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Encryption failed: {e}")
@@ -312,10 +521,12 @@ class SmartNotesApp(QMainWindow):
             self.redis_cache.cache_note(note_to_save)
         else:
             self.db.save_note(note_to_save)
-            
+        self._stats_dirty = True
+
         self.load_note_headers()
-        self.save_btn.setEnabled(False)
+        _set_enabled(self.save_btn, False)
         self.set_status(f"Saved: '{self.current_note.title}'")
+        self.update_cache_status()
         self.update_analytics()
 
     def delete_note(self):
@@ -323,12 +534,13 @@ class SmartNotesApp(QMainWindow):
         if not current_item: QMessageBox.warning(self, "Warning", "Please select a note to delete.")
         else:
             note_id = current_item.data(Qt.ItemDataRole.UserRole)
-            title = current_item.text().split('  •  #')[0]
+            title = current_item.data(Qt.ItemDataRole.UserRole + 1)
 
             reply = QMessageBox.question(self, "Delete Note", f"Are you sure you want to delete '{title}'?",
                                          QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
             if reply == QMessageBox.StandardButton.Yes:
                 self.db.delete_note(note_id)
+                self._stats_dirty = True
                 self.load_note_headers()
                 self.clear_editor()
                 self.set_status(f"Deleted: '{title}'")
@@ -338,9 +550,11 @@ class SmartNotesApp(QMainWindow):
         self.title_input.clear()
         self.tags_input.clear()
         self.content_editor.clear()
+        self._begin_load()
         self.current_note = None
-        self.save_btn.setEnabled(False)
-        self.update_analytics()
+        self._preview_dirty = True
+        _set_enabled(self.save_btn, False)
+        self._recount_words()
 
     def _show_inline_edit(self):
         self.inline_edit_bar.show_at_cursor(self.content_editor)
@@ -373,18 +587,22 @@ class SmartNotesApp(QMainWindow):
                 return True
         return super().eventFilter(obj, event)
 
-    def on_content_changed(self):
-        self.ghost_overlay.clear()
+    def _schedule_content_changed(self):
+        """Coalesce a burst of textChanged signals into one on_content_changed call"""
+        # Drop the suggestion now, not after the coalescing delay: Tab must not insert a stale one
         self._current_suggestion = ""
+        self.ghost_overlay.clear()
+        self._content_dirty_timer.start()
+
+    def on_content_changed(self):
         self._suggestion_timer.start(320)
         if self.current_note is not None:
-            self.save_btn.setEnabled(True)
-            # Immediately render preview if we're on the preview tab
-            if hasattr(self, 'editor_tabs') and self.editor_tabs.currentIndex() == 1:
+            _set_enabled(self.save_btn, True)
+            if self._preview_visible:
                 self.render_preview()
             else:
-                # Otherwise use timer to avoid frequent updates while typing
-                self.preview_timer.start(250)
+                self._preview_dirty = True
+            self.word_count_timer.start(400)
             self.update_analytics()
 
     def on_search(self, text):
@@ -395,30 +613,59 @@ class SmartNotesApp(QMainWindow):
         if self.last_search_query:
             self.perform_search(self.last_search_query)
         else:
+            self._search_token += 1
+            self.operation_progress.setVisible(False)
             self.load_note_headers()
 
     def perform_search(self, query: str):
+        # Results from searches superseded by newer keystrokes are dropped
+        self._search_token += 1
+        token = self._search_token
         start_time = time.time()
         self.operation_progress.setVisible(True)
         self.operation_progress.setRange(0, 0)
-        try:
-            results = self.db.search_note_headers(query)
-            self.refresh_notes_list(results)
-            self.last_search_time = round((time.time() - start_time) * 1000, 1)
-            self.set_status(f"Found {len(results)} results for '{query}' ({self.last_search_time}ms)")
-        except Exception as e:
-            logger.error(f"Search error: {e}")
-            self.set_status(f"Search error: {e}")
-        finally:
-            self.operation_progress.setVisible(False)
-            self.update_analytics()
+        run_in_pool(
+            self.db.search_note_headers, query,
+            on_finished=lambda results: self._on_search_finished(token, query, start_time, results),
+            on_error=lambda err: self._on_search_error(token, err),
+        )
 
-    def render_preview(self):
-        if not hasattr(self, 'preview_view') or not self.preview_view: 
+    def _on_search_finished(self, token: int, query: str, start_time: float, results: list):
+        if token != self._search_token:
             return
-        
+        self.refresh_notes_list(results)
+        self.last_search_time = round((time.time() - start_time) * 1000, 1)
+        self.set_status(f"Found {len(results)} results for '{query}' ({self.last_search_time}ms)")
+        self.operation_progress.setVisible(False)
+        self.update_analytics()
+
+    def _on_search_error(self, token: int, err: str):
+        if token != self._search_token:
+            return
+        logger.error(f"Search error: {err}")
+        self.set_status(f"Search error: {err}")
+        self.operation_progress.setVisible(False)
+        self.update_analytics()
+
+    def render_preview(self, force: bool = False):
+        if force:
+            # Re-render from scratch: reload the web shell and drop the last-rendered key
+            self._preview_shell_state = None
+            self._last_preview_key = None
+        if getattr(self, 'preview_view', None) is None:
+            self._preview_dirty = True
+            return
+
+        # Nobody can see a hidden preview; render when its tab is shown instead
+        if not self.preview_view.isVisible():
+            self._preview_dirty = True
+            return
+        self._preview_dirty = False
+
         # Ensure we have a current note
         if not self.current_note:
+            self._preview_shell_state = None
+            self._last_preview_key = None
             if hasattr(self.preview_view, 'setHtml'):
                 self.preview_view.setHtml("<p style='color: #64748b; text-align: center; margin-top: 50px;'>No note selected</p>")
             else:
@@ -426,148 +673,143 @@ class SmartNotesApp(QMainWindow):
             return
 
         content_format = self.format_combo.currentText().lower()
-        
+        if content_format == 'markdown':
+            content = self.content_editor.toPlainText()
+        else:
+            content = self.content_editor.toHtml()
+
+        # Nothing to do if this exact content was the last thing rendered
+        preview_key = (content_format, hash(content))
+        if preview_key == self._last_preview_key:
+            return
+        self._last_preview_key = preview_key
+
         # Check if we're using QWebEngineView or QTextEdit
         is_web_engine = hasattr(self.preview_view, 'setHtml') and hasattr(self.preview_view, 'page')
         
         if content_format == 'markdown':
-            content = self.content_editor.toPlainText()
-            
             # Handle empty content
             if not content.strip():
                 placeholder = "# Welcome to Markdown!\n\nStart typing your markdown content here...\n\n**Bold text**, *italic text*, and `code`"
-                if hasattr(self.preview_view, 'setHtml'):
+                self._preview_shell_state = None
+                if is_web_engine:
                     self.preview_view.setHtml(f"<div style='color: #64748b; text-align: center; margin-top: 50px;'><em>{placeholder}</em></div>")
                 else:
-                    self.preview_view.setPlainText(placeholder)
+                    self.preview_view.document().setMarkdown(placeholder)
                 return
             
-            if md:
+            if not is_web_engine:
+                # QTextEdit renders markdown natively; no Python-side HTML conversion
+                self.preview_view.document().setMarkdown(
+                    content, QTextDocument.MarkdownFeature.MarkdownDialectGitHub)
+            elif _get_md():
                 try:
-                    extensions = app_config.get('markdown_extensions', []) if app_config else []
-                    html = md.markdown(content, extensions=extensions)
-                    
-                    if is_web_engine:
-                        # Full HTML for QWebEngineView
-                        styled_html = f"""
-                        <!DOCTYPE html>
-                        <html>
-                        <head>
-                            <meta charset="utf-8">
-                            <style>
-                                body {{
-                                    background: rgba(15, 23, 42, 0.9);
-                                    color: #f1f5f9;
-                                    font-family: 'Segoe UI', system-ui, sans-serif;
-                                    line-height: 1.6;
-                                    padding: 24px;
-                                    margin: 0;
-                                }}
-                                h1, h2, h3, h4, h5, h6 {{
-                                    color: #93c5fd;
-                                    margin-top: 1.5em;
-                                    margin-bottom: 0.5em;
-                                    font-weight: 600;
-                                }}
-                                h1 {{ font-size: 2em; border-bottom: 2px solid rgba(59, 130, 246, 0.3); padding-bottom: 0.3em; }}
-                                h2 {{ font-size: 1.6em; border-bottom: 1px solid rgba(59, 130, 246, 0.2); padding-bottom: 0.2em; }}
-                                p {{ margin-bottom: 1em; }}
-                                a {{
-                                    color: #60a5fa;
-                                    text-decoration: none;
-                                    border-bottom: 1px solid rgba(96, 165, 250, 0.3);
-                                }}
-                                a:hover {{
-                                    color: #93c5fd;
-                                    border-bottom-color: rgba(147, 197, 253, 0.6);
-                                }}
-                                code {{
-                                    background: rgba(30, 41, 59, 0.8);
-                                    color: #fbbf24;
-                                    padding: 2px 6px;
-                                    border-radius: 4px;
-                                    font-family: 'Consolas', 'Monaco', monospace;
-                                    font-size: 0.9em;
-                                }}
-                                pre {{
-                                    background: rgba(30, 41, 59, 0.8);
-                                    border: 1px solid rgba(51, 65, 85, 0.3);
-                                    border-radius: 8px;
-                                    padding: 16px;
-                                    overflow-x: auto;
-                                    margin: 1em 0;
-                                }}
-                                pre code {{
-                                    background: transparent;
-                                    padding: 0;
-                                    color: #e2e8f0;
-                                }}
-                            </style>
-                        </head>
-                        <body>
-                            {html}
-                        </body>
-                        </html>
-                        """
-                        self.preview_view.setHtml(styled_html)
-                    else:
-                        # For QTextEdit, use simpler HTML or plain text
-                        self.preview_view.setHtml(html)
-                        
+                    # Only the body changes; the styled shell is parsed once
+                    self._set_preview_body(self._markdown_to_html(content))
                 except Exception as e:
                     logger.error(f"Markdown rendering error: {e}")
-                    if is_web_engine:
-                        self.preview_view.setHtml(f"<pre>{content}</pre>")
-                    else:
-                        self.preview_view.setPlainText(content)
+                    self._set_preview_body(f"<pre>{content}</pre>")
             else:
                 # No markdown library available
-                if is_web_engine:
-                    self.preview_view.setHtml(f"<pre>{content}</pre>")
-                else:
-                    self.preview_view.setPlainText(content)
+                self._set_preview_body(f"<pre>{content}</pre>")
         else: 
             # HTML format
             if is_web_engine:
-                self.preview_view.setHtml(self.content_editor.toHtml())
+                self._preview_shell_state = None
+                self.preview_view.setHtml(content)
             else:
-                self.preview_view.setHtml(self.content_editor.toHtml())
+                self.preview_view.setHtml(content)
+
+    def _set_preview_body(self, html: str):
+        """Swap the web preview's body via JS, loading the styled shell on first use"""
+        self._pending_preview_body = html
+        if self._preview_shell_state == 'ready':
+            # Edits such as trailing whitespace often render to identical HTML
+            if html == self._last_preview_html:
+                return
+            self.preview_view.page().runJavaScript(
+                f"document.getElementById('content').innerHTML = {json.dumps(html)};")
+            self._last_preview_html = html
+        elif self._preview_shell_state is None:
+            self._preview_shell_state = 'loading'
+            self._last_preview_html = None
+            self.preview_view.setHtml(_PREVIEW_SHELL)
+
+    def _on_preview_load_finished(self, ok: bool):
+        if self._preview_shell_state != 'loading':
+            return
+        if not ok:
+            # Let the next render retry, even for unchanged content
+            self._preview_shell_state = None
+            self._last_preview_key = None
+            return
+        self._preview_shell_state = 'ready'
+        if self._pending_preview_body is not None:
+            self._set_preview_body(self._pending_preview_body)
+
+    def _build_markdown(self):
+        """Create the Markdown converter reused by every preview render"""
+        extensions = app_config.get('markdown_extensions', []) if app_config else []
+        return _get_md().Markdown(extensions=extensions)
+
+    def _markdown_to_html(self, content: str) -> str:
+        html = self._md_cache.get(content)
+        if html is not None:
+            self._md_cache.move_to_end(content)
+            return html
+        if self._md is None:
+            self._md = self._build_markdown()
+        html = self._md.reset().convert(content)
+        self._md_cache[content] = html
+        if len(self._md_cache) > _MARKDOWN_CACHE_SIZE:
+            self._md_cache.popitem(last=False)
+        return html
+
+    def _get_stats_cached(self):
+        """Return DB stats, re-querying only after a save/delete/flush"""
+        if self._stats_dirty or self._stats_cache is None:
+            self._stats_cache = self.db.get_stats()
+            self._stats_dirty = False
+        return self._stats_cache
 
     def update_analytics(self):
-        stats = self.db.get_stats()
+        stats = self._get_stats_cached()
         self.analytics_notes.setText(f"Notes: {stats.get('total_notes', 0)}")
         if self.current_note:
-            text = self.content_editor.toPlainText()
-            words = len([w for w in text.split() if w.strip()])
-            chars = len(text)
-            self.word_count_label.setText(f"{words} words, {chars} chars")
+            # characterCount() includes the trailing paragraph separator
+            chars = self.content_editor.document().characterCount() - 1
+            self.word_count_label.setText(f"{self._word_cache} words, {chars} chars")
             format_text = self.current_note.content_format.upper()
             lock_status = "Locked" if self.current_note.locked else "Unlocked"
             self.analytics_format.setText(f"Format: {format_text} | {lock_status}")
-            self.lock_btn.setChecked(self.current_note.locked)
+            _set_checked(self.lock_btn, self.current_note.locked)
             self.lock_btn.setText("🔒" if self.current_note.locked else "🔓")
         else:
             self.word_count_label.setText("0 words, 0 chars")
             self.analytics_format.setText("Format: - | -")
-        
-        if self.redis_cache.enabled:
-            self.analytics_redis.setText(f"Cache: {self.redis_cache.dirty_count()} dirty")
-        else:
-            self.analytics_redis.setText("Cache: Off")
 
         if self.last_search_time < 50: performance = "Fast"
         elif self.last_search_time < 200: performance = "Good"
         else: performance = "Slow"
         self.analytics_status.setText(performance if self.last_search_query else "Ready")
 
+    def _recount_words(self):
+        self._word_cache = len(self.content_editor.toPlainText().split())
+        self.update_analytics()
+
     def update_stats(self):
-        stats = self.db.get_stats()
+        stats = self._get_stats_cached()
         self.notes_count_label.setText(f"Notes: {stats['total_notes']}")
         self.db_size_label.setText(f"Database: {stats['db_size_kb']} KB")
+
+    def update_cache_status(self):
+        """Refresh the Redis dirty count; only saves and flushes change it"""
         if self.redis_cache.enabled:
-            self.cache_label.setText(f"Cache: {self.redis_cache.dirty_count()} dirty")
+            text = f"Cache: {self.redis_cache.dirty_count()} dirty"
         else:
-            self.cache_label.setText("Cache: Off")
+            text = "Cache: Off"
+        self.analytics_redis.setText(text)
+        self.cache_label.setText(text)
 
     def auto_save(self):
         if self.current_note and self.save_btn.isEnabled():
@@ -575,14 +817,33 @@ class SmartNotesApp(QMainWindow):
             self.set_status("Auto-saved", 2000)
 
     def flush_cache_periodic(self):
-        if self.redis_cache.enabled:
-            flushed, errors = self.redis_cache.flush_to_db(self.db)
-            if flushed: self.set_status(f"Flushed {flushed} note(s) to DB from cache", 2000)
-            if errors: self.set_status("Cache flush error", 3000)
-            self.update_analytics()
+        if not self.redis_cache.enabled or self._flush_in_progress:
+            return
+        self._flush_in_progress = True
+        self._flush_done.clear()
+        self.analytics_status.setText("Flushing...")
+        run_in_pool(self._flush_cache_job, on_finished=self._on_cache_flushed)
+
+    def _flush_cache_job(self):
+        try:
+            return self.redis_cache.flush_to_db(self.db)
+        finally:
+            self._flush_done.set()
+
+    def _on_cache_flushed(self, result):
+        self._flush_in_progress = False
+        flushed, errors = result
+        if flushed: self._stats_dirty = True
+        if flushed: self.set_status(f"Flushed {flushed} note(s) to DB from cache", 2000)
+        if errors: self.set_status("Cache flush error", 3000)
+        self.update_cache_status()
+        self.update_analytics()
 
     def toggle_lock_current(self):
         if not self.current_note: return
+        if self._unlock_pending():
+            self.set_status("Still unlocking note...", 2000)
+            return
         if self.current_note.locked:
             pwd = self.prompt_password("Unlock Note", "Enter password to unlock:")
             if not pwd: return
@@ -593,17 +854,19 @@ class SmartNotesApp(QMainWindow):
                     self.content_editor.setHtml(plain_content)
                 else:
                     self.content_editor.setPlainText(plain_content)
-                self.save_btn.setEnabled(True)
-            except (ValueError, InvalidToken):
+                _set_enabled(self.save_btn, True)
+            except ValueError:
                 QMessageBox.critical(self, "Error", "Incorrect password.")
+            except RuntimeError as e:
+                QMessageBox.critical(self, "Error", str(e))
         else:
-            if not Fernet:
+            if not encryption_available():
                 QMessageBox.warning(self, "Unavailable", "Install 'cryptography' to lock notes.")
                 return
             pwd = self.prompt_password("Lock Note", "Set a password for this note:", confirm=True)
             if pwd:
                 self.current_note.locked = True
-                self.save_btn.setEnabled(True)
+                _set_enabled(self.save_btn, True)
         self.update_analytics()
 
     def prompt_password(self, title: str, label: str, confirm: bool = False) -> Optional[str]:
@@ -644,7 +907,13 @@ class SmartNotesApp(QMainWindow):
         self.auto_save_timer.stop()
         self.search_timer.stop()
         self.redis_flush_timer.stop()
-        self.flush_cache_periodic()
+        # Final flush runs inline so nothing is left in the cache on exit. It must not overlap a
+        # periodic flush still running on the pool; if that one is stuck, leave the notes marked
+        # dirty in Redis for the next session rather than writing them twice at once.
+        if not self._flush_in_progress or self._flush_done.wait(5):
+            self.redis_cache.flush_to_db(self.db)
+        else:
+            logger.warning("Cache flush still running on exit; remaining notes flush next session")
         self.discord.close()
         settings = self.get_settings()
         if settings:
@@ -671,13 +940,17 @@ class SmartNotesApp(QMainWindow):
             new_format = format_text.lower()
             if new_format != self.current_note.content_format:
                 self.current_note.content_format = new_format
-                self.save_btn.setEnabled(True)
+                _set_enabled(self.save_btn, True)
                 self.render_preview()  # Update preview immediately when format changes
                 self.update_analytics()
 
     def on_tab_changed(self, index):
-        if index == 1:  # Preview tab
-            self.render_preview()
+        self._preview_visible = index == 1
+        if self._preview_visible:  # Preview tab
+            if not self._preview_built:
+                create_preview_view(self)
+            if self._preview_dirty:
+                self.render_preview()
 
     def insert_link(self):
         text, ok = QInputDialog.getText(self, "Insert Link", "URL:")
@@ -757,6 +1030,12 @@ print('Hello, World!')
         if dialog.exec() == QDialog.DialogCode.Accepted and dialog.settings_changed:
             QMessageBox.information(self, "Settings Saved", "Some settings require an application restart to take effect.")
             self.restart_timers()
+            self._md = None
+            self._md_cache.clear()
+            self._last_preview_key = None
+            self._preview_dirty = True
+            if not app_config.get('kdf_cache_enabled', True):
+                clear_key_cache()
 
     def show_debug_info(self):
         stats = self.db.get_stats()
@@ -781,19 +1060,27 @@ Current Note: Format {self.current_note.content_format if self.current_note else
         self.redis_flush_timer.start(cfg.get('redis_flush_interval_s', 60) * 1000)
 
     def update_format_buttons(self):
-        if hasattr(self, 'format_buttons'):
+        if hasattr(self, 'bold_btn'):
             fmt = self.content_editor.currentCharFormat()
-            self.format_buttons['B'].setChecked(fmt.fontWeight() == QFont.Weight.Bold)
-            self.format_buttons['I'].setChecked(fmt.fontItalic())
-            self.format_buttons['U'].setChecked(fmt.fontUnderline())
+            sig = (fmt.fontWeight() == QFont.Weight.Bold, fmt.fontItalic(), fmt.fontUnderline())
+            if sig == self._last_fmt_sig:
+                return
+            self._last_fmt_sig = sig
+            for btn, checked in zip((self.bold_btn, self.italic_btn, self.underline_btn), sig):
+                blocker = QSignalBlocker(btn)
+                btn.setChecked(checked)
+                blocker.unblock()
 
     def toggle_bold(self):
+        self._last_fmt_sig = None
         self.content_editor.setFontWeight(QFont.Weight.Bold if self.content_editor.fontWeight() != QFont.Weight.Bold else QFont.Weight.Normal)
 
     def toggle_italic(self):
+        self._last_fmt_sig = None
         self.content_editor.setFontItalic(not self.content_editor.fontItalic())
 
     def toggle_underline(self):
+        self._last_fmt_sig = None
         self.content_editor.setFontUnderline(not self.content_editor.fontUnderline())
 
     def set_alignment(self, alignment):
@@ -802,20 +1089,33 @@ Current Note: Format {self.current_note.content_format if self.current_note else
     def resizeEvent(self, event):
         """Handle window resize events for responsive design"""
         super().resizeEvent(event)
-        
+        if hasattr(self, '_resize_timer'):
+            self._resize_timer.start()
+
+    def _apply_splitter_sizes(self):
+        """Apply the responsive splitter layout for the current window width"""
         if not hasattr(self, 'splitter'):
             return
         
         window_width = self.width()
-        window_height = self.height()
-        current_sizes = self.splitter.sizes()
-        
-        # Responsive breakpoints
         if window_width < 800:
+            bucket, sidebar_width = 'tiny', 200
+        elif window_width < 1000:
+            bucket, sidebar_width = 'small', 250
+        elif window_width < 1200:
+            bucket, sidebar_width = 'medium', 280
+        else:
+            bucket, sidebar_width = 'large', int(min(320, window_width * 0.25))  # Max 25% of window width
+
+        # The content pane stretches on its own; only relayout when the breakpoint changes
+        if (bucket, sidebar_width) == self._splitter_bucket:
+            return
+        self._splitter_bucket = (bucket, sidebar_width)
+        self.splitter.setSizes([sidebar_width, window_width - sidebar_width - 20])
+
+        # Responsive breakpoints
+        if bucket == 'tiny':
             # Very small - minimize sidebar
-            sidebar_width = 200
-            content_width = window_width - sidebar_width - 20
-            self.splitter.setSizes([sidebar_width, content_width])
             
             # Hide some sidebar elements for very small screens
             if hasattr(self, 'left_panel'):
@@ -827,21 +1127,8 @@ Current Note: Format {self.current_note.content_format if self.current_note else
                 except:
                     pass
                     
-            # Also hide some formatting buttons on very small screens
-            if hasattr(self, 'format_buttons'):
-                try:
-                    compact_buttons = ['Code', 'Img', 'Link']  # Hide these on small screens
-                    for btn_name, btn in self.format_buttons.items():
-                        if btn_name in compact_buttons:
-                            btn.setVisible(False)
-                except:
-                    pass
-                    
-        elif window_width < 1000:
+        elif bucket == 'small':
             # Small - compact sidebar
-            sidebar_width = 250
-            content_width = window_width - sidebar_width - 20
-            self.splitter.setSizes([sidebar_width, content_width])
             
             # Show analytics but hide some buttons
             if hasattr(self, 'left_panel'):
@@ -852,24 +1139,8 @@ Current Note: Format {self.current_note.content_format if self.current_note else
                 except:
                     pass
                     
-            if hasattr(self, 'format_buttons'):
-                try:
-                    # Show important buttons, hide some advanced ones
-                    hide_buttons = ['Code', 'Img']
-                    show_buttons = ['Link']
-                    for btn_name, btn in self.format_buttons.items():
-                        if btn_name in hide_buttons:
-                            btn.setVisible(False)
-                        elif btn_name in show_buttons:
-                            btn.setVisible(True)
-                except:
-                    pass
-            
-        elif window_width < 1200:
+        elif bucket == 'medium':
             # Medium - normal sidebar
-            sidebar_width = 280
-            content_width = window_width - sidebar_width - 20
-            self.splitter.setSizes([sidebar_width, content_width])
             
             # Show all elements
             if hasattr(self, 'left_panel'):
@@ -880,18 +1151,8 @@ Current Note: Format {self.current_note.content_format if self.current_note else
                 except:
                     pass
                     
-            if hasattr(self, 'format_buttons'):
-                try:
-                    for btn_name, btn in self.format_buttons.items():
-                        btn.setVisible(True)
-                except:
-                    pass
-            
         else:
             # Large - comfortable sidebar
-            sidebar_width = min(320, window_width * 0.25)  # Max 25% of window width
-            content_width = window_width - sidebar_width - 20
-            self.splitter.setSizes([sidebar_width, content_width])
             
             # Show all elements
             if hasattr(self, 'left_panel'):
@@ -901,10 +1162,3 @@ Current Note: Format {self.current_note.content_format if self.current_note else
                         widget.setVisible(True)
                 except:
                     pass
-                    
-            if hasattr(self, 'format_buttons'):
-                try:
-                    for btn_name, btn in self.format_buttons.items():
-                        btn.setVisible(True)
-                except:
-                    pass
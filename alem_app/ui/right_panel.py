@@ -1,9 +1,11 @@
 
-from PyQt6.QtCore import Qt, QSize
+from functools import partial
+
+from PyQt6.QtCore import Qt, QSize, QSignalBlocker
 from PyQt6.QtGui import QFont
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, 
-    QTextEdit, QComboBox, QTabWidget, QStyle
+    QTextEdit, QComboBox, QTabWidget, QStyle, QLayout, QFrame
 )
 
 from config import config as app_config
@@ -14,18 +16,202 @@ except ImportError:
     QWebEngineView = None
 
 
+_EDITOR_FONT = None
+_SAVE_ICON = None
+
+# Toolbar buttons as (label, tooltip, main window method, argument); None is a separator
+_FMT_SPEC = (
+    ("B", "Bold", 'toggle_bold', None),
+    ("I", "Italic", 'toggle_italic', None),
+    ("U", "Underline", 'toggle_underline', None),
+    None,
+    ("◄", "Align Left", 'set_alignment', Qt.AlignmentFlag.AlignLeft),
+    ("■", "Center", 'set_alignment', Qt.AlignmentFlag.AlignCenter),
+    ("►", "Align Right", 'set_alignment', Qt.AlignmentFlag.AlignRight),
+    None,
+    ("Link", "Insert Link", 'insert_link', None),
+    ("Img", "Insert Image", 'insert_image', None),
+    ("Code", "Insert Code", 'insert_code_block', None),
+)
+
+# Checkable toolbar buttons, exposed on the main window for update_format_buttons
+_TOGGLE_BUTTON_ATTRS = {"B": 'bold_btn', "I": 'italic_btn', "U": 'underline_btn'}
+
+# Single stylesheet for the whole panel; widgets are targeted by object name.
+# Container rules come first so the per-widget rules below win specificity ties.
+_STYLE_RIGHT_PANEL = """
+QWidget {
+    background: rgba(15, 23, 42, 0.7);
+    border: 1px solid rgba(51, 65, 85, 0.3);
+    border-radius: 12px;
+}
+
+#headerContainer, #headerContainer QWidget {
+    background: rgba(30, 41, 59, 0.8);
+    border: 1px solid rgba(51, 65, 85, 0.3);
+    border-radius: 12px;
+    padding: 16px;
+}
+#toolbarContainer, #toolbarContainer QWidget { background: rgba(30,41,59,.8); border: 1px solid rgba(51,65,85,.3); border-radius: 10px; padding: 8px 12px; }
+#actionsContainer, #actionsContainer QWidget { background: rgba(30,41,59,.8); border: 1px solid rgba(51,65,85,.3); border-radius: 10px; padding: 12px 16px; }
+
+QLineEdit#titleInput {
+    padding: 14px 18px;
+    border: 1px solid rgba(51, 65, 85, 0.3);
+    border-radius: 10px;
+    font-size: 18px;
+    color: #f1f5f9;
+    background: rgba(15, 23, 42, 0.8);
+    font-family: 'Segoe UI', system-ui, sans-serif;
+    font-weight: 600;
+}
+QLineEdit#titleInput:focus {
+    border: 1px solid rgba(59, 130, 246, 0.5);
+    background: rgba(15, 23, 42, 0.9);
+    color: #f8fafc;
+}
+QLineEdit#titleInput::placeholder { color: #64748b; font-weight: 400; }
+
+QLabel#fieldLabel { color:#94a3b8; font-weight:500; font-size:12px; }
+
+QLineEdit#tagsInput {
+    padding: 10px 16px;
+    border: 1px solid rgba(51, 65, 85, 0.3);
+    border-radius: 8px;
+    font-size: 13px;
+    color: #e2e8f0;
+    background: rgba(15, 23, 42, 0.6);
+}
+QLineEdit#tagsInput:focus {
+    border: 1px solid rgba(139, 92, 246, 0.5);
+    background: rgba(15, 23, 42, 0.8);
+    color: #f1f5f9;
+}
+
+QPushButton#lockBtn { background: rgba(71,85,105,.3); color: #94a3b8; border: 1px solid rgba(71,85,105,.4); border-radius: 8px; font-size: 16px; }
+QPushButton#lockBtn:checked { background: rgba(239,68,68,.3); color:#ef4444; border:1px solid rgba(239,68,68,.4); }
+QPushButton#lockBtn:hover { background: rgba(59,130,246,.3); }
+
+QComboBox#formatCombo { background: rgba(15,23,42,.8); border: 1px solid rgba(51,65,85,.3); border-radius: 6px; padding: 4px 8px; color: #e2e8f0; font-weight: 500; min-width: 80px; }
+QComboBox#formatCombo:focus { border: 1px solid rgba(59,130,246,.5); }
+QComboBox#formatCombo::drop-down { border: none; }
+QComboBox#formatCombo::down-arrow { image: none; border-left:4px solid transparent; border-right:4px solid transparent; border-top:4px solid #94a3b8; margin-right:6px; }
+
+QFrame#toolbarSep { background: #475569; border: none; border-radius: 0px; padding: 0px; margin: 8px 4px; }
+
+QPushButton#fmtBtn {
+    background: rgba(71,85,105,.3);
+    color: #e2e8f0;
+    border: 1px solid rgba(71,85,105,.4);
+    border-radius: 6px;
+    font-weight: 600;
+    font-size: 11px;
+    font-family: 'Segoe UI', system-ui, sans-serif;
+    min-width: 36px;
+    min-height: 28px;
+}
+QPushButton#fmtBtn:checked {
+    background: rgba(59,130,246,.4);
+    color: #ffffff;
+    border: 1px solid rgba(59,130,246,.6);
+}
+QPushButton#fmtBtn:hover {
+    background: rgba(71,85,105,.5);
+    color: #f1f5f9;
+    border: 1px solid rgba(71,85,105,.6);
+}
+QPushButton#fmtBtn:pressed {
+    background: rgba(59,130,246,.3);
+}
+
+QPushButton#sizeBtn {
+    background: rgba(71,85,105,.3);
+    color: #e2e8f0;
+    border: 1px solid rgba(71,85,105,.4);
+    border-radius: 6px;
+    font-weight: 600;
+    font-size: 10px;
+    font-family: 'Segoe UI', system-ui, sans-serif;
+}
+QPushButton#sizeBtn:hover {
+    background: rgba(71,85,105,.4);
+    color: #f1f5f9;
+}
+
+QTabWidget#editorTabs::pane { border: 1px solid rgba(51,65,85,.3); border-radius: 12px; background: rgba(30,41,59,.6); padding: 0px; }
+#editorTabs QTabBar::tab { background: rgba(71,85,105,.3); color:#94a3b8; padding: 12px 24px; margin: 2px; border-radius: 8px; font-weight: 600; font-size: 13px; border: 1px solid rgba(71,85,105,.4); min-width: 80px; }
+#editorTabs QTabBar::tab:selected { background: rgba(59,130,246,.3); color:#93c5fd; border: 1px solid rgba(59,130,246,.4); }
+#editorTabs QTabBar::tab:hover:!selected { background: rgba(71,85,105,.4); color:#cbd5e1; }
+
+QTextEdit#contentEditor { border: 1px solid rgba(51,65,85,.3); border-radius: 12px; padding: 24px; background: rgba(15,23,42,.8); color:#f1f5f9; line-height: 1.6; font-family: 'Segoe UI', system-ui, sans-serif; font-weight: 400; font-size: 14px; selection-background-color: rgba(59,130,246,.3); selection-color: #bfdbfe; }
+QTextEdit#contentEditor:focus { border: 1px solid rgba(59,130,246,.5); background: rgba(15,23,42,.9); }
+#contentEditor QScrollBar:vertical { background: rgba(15,23,42,.4); width: 12px; border-radius: 6px; margin: 0px; }
+#contentEditor QScrollBar::handle:vertical { background: rgba(71,85,105,.6); border-radius: 6px; min-height: 20px; margin: 2px; }
+#contentEditor QScrollBar::handle:vertical:hover { background: rgba(59,130,246,.6); }
+#contentEditor QScrollBar::add-line:vertical, #contentEditor QScrollBar::sub-line:vertical { height: 0px; }
+
+QWebEngineView#previewView { border: 1px solid rgba(51,65,85,.3); border-radius: 12px; background: rgba(15,23,42,.8); }
+QTextEdit#previewView { border: 1px solid rgba(51,65,85,.3); border-radius: 12px; padding: 24px; background: rgba(15,23,42,.8); color:#f1f5f9; font-family: 'Segoe UI', system-ui, sans-serif; font-size: 14px; line-height: 1.6; }
+
+QLabel#wordCount { color:#64748b; font-weight:500; font-size:12px; background: rgba(15,23,42,.6); padding: 6px 12px; border:1px solid rgba(51,65,85,.3); border-radius: 6px; }
+
+QPushButton#saveBtn { background: qlineargradient(x1:0,y1:0,x2:1,y2:1, stop:0 rgba(34,197,94,.3), stop:1 rgba(59,130,246,.2)); color:#22c55e; border:1px solid rgba(34,197,94,.4); padding:10px 20px; border-radius:8px; font-weight:600; font-size:12px; min-height:20px; }
+QPushButton#saveBtn:hover:enabled { background: qlineargradient(x1:0,y1:0,x2:1,y2:1, stop:0 rgba(34,197,94,.4), stop:1 rgba(59,130,246,.3)); color:#4ade80; border:1px solid rgba(34,197,94,.5); }
+QPushButton#saveBtn:pressed:enabled { background: qlineargradient(x1:0,y1:0,x2:1,y2:1, stop:0 rgba(34,197,94,.5), stop:1 rgba(59,130,246,.4)); }
+QPushButton#saveBtn:disabled { background: rgba(71,85,105,.2); color:#64748b; border:1px solid rgba(71,85,105,.3); }
+"""
+
+
+def _get_editor_font() -> QFont:
+    """Shared editor font; created on first use since QFont needs a QApplication"""
+    global _EDITOR_FONT
+    if _EDITOR_FONT is None:
+        _EDITOR_FONT = QFont("Segoe UI", 14)
+    return _EDITOR_FONT
+
+
+def _get_save_icon(widget):
+    """Themed save icon, looked up from the widget's style once per process"""
+    global _SAVE_ICON
+    if _SAVE_ICON is None:
+        _SAVE_ICON = widget.style().standardIcon(QStyle.StandardPixmap.SP_DialogSaveButton)
+    return _SAVE_ICON
+
+
+def _make_separator() -> QFrame:
+    """Thin vertical divider for the toolbar, styled by the panel stylesheet"""
+    sep = QFrame()
+    sep.setFrameShape(QFrame.Shape.VLine)
+    sep.setFixedWidth(9)  # 1px line plus the 4px side margins
+    sep.setObjectName('toolbarSep')
+    return sep
+
+
+def _add_all(layout, *items):
+    """Add widgets and layouts to layout in order; None adds a stretch"""
+    add_widget, add_layout, add_stretch = layout.addWidget, layout.addLayout, layout.addStretch
+    # Hold off geometry updates until everything is in; the pending layout request does one pass
+    layout.setEnabled(False)
+    try:
+        for item in items:
+            if item is None:
+                add_stretch()
+            elif isinstance(item, QLayout):
+                add_layout(item)
+            else:
+                add_widget(item)
+    finally:
+        layout.setEnabled(True)
+
+
 def create_right_panel(main_window):
     """Create enhanced right panel with modern editor"""
+    # Built once per window; rebuilding would spawn another web engine view
+    if getattr(main_window, '_right_panel', None) is not None:
+        return main_window._right_panel
+
     panel = QWidget()
-    panel.setStyleSheet(
-        """
-        QWidget {
-            background: rgba(15, 23, 42, 0.7);
-            border: 1px solid rgba(51, 65, 85, 0.3);
-            border-radius: 12px;
-        }
-        """
-    )
+    panel.setStyleSheet(_STYLE_RIGHT_PANEL)
 
     layout = QVBoxLayout(panel)
     layout.setSpacing(16)
@@ -33,318 +219,175 @@ def create_right_panel(main_window):
 
     # Header with metadata
     header_container = QWidget()
-    header_container.setStyleSheet(
-        """
-        QWidget {
-            background: rgba(30, 41, 59, 0.8);
-            border: 1px solid rgba(51, 65, 85, 0.3);
-            border-radius: 12px;
-            padding: 16px;
-        }
-        """
-    )
+    header_container.setObjectName('headerContainer')
 
     header_layout = QVBoxLayout(header_container)
     header_layout.setSpacing(12)
 
     title_layout = QHBoxLayout()
-    title_layout.addWidget(QLabel())
 
     main_window.title_input = QLineEdit()
     main_window.title_input.setPlaceholderText("Enter an amazing title...")
-    main_window.title_input.textChanged.connect(main_window.on_content_changed)
-    main_window.title_input.setStyleSheet(
-        """
-        QLineEdit {
-            padding: 14px 18px;
-            border: 1px solid rgba(51, 65, 85, 0.3);
-            border-radius: 10px;
-            font-size: 18px;
-            color: #f1f5f9;
-            background: rgba(15, 23, 42, 0.8);
-            font-family: 'Segoe UI', system-ui, sans-serif;
-            font-weight: 600;
-        }
-        QLineEdit:focus {
-            border: 1px solid rgba(59, 130, 246, 0.5);
-            background: rgba(15, 23, 42, 0.9);
-            color: #f8fafc;
-        }
-        QLineEdit::placeholder { color: #64748b; font-weight: 400; }
-        """
-    )
-    title_layout.addWidget(main_window.title_input)
-    header_layout.addLayout(title_layout)
+    main_window.title_input.textChanged.connect(main_window._schedule_content_changed)
+    main_window.title_input.setObjectName('titleInput')
+    _add_all(title_layout, QLabel(), main_window.title_input)
 
     meta_layout = QHBoxLayout()
     tags_container = QHBoxLayout()
     tags_label = QLabel("Tags:")
-    tags_label.setStyleSheet("color:#94a3b8;font-weight:500;font-size:12px;")
-    tags_container.addWidget(tags_label)
+    tags_label.setObjectName('fieldLabel')
     main_window.tags_input = QLineEdit()
     main_window.tags_input.setPlaceholderText("Add tags: productivity, ideas, work...")
-    main_window.tags_input.textChanged.connect(main_window.on_content_changed)
-    main_window.tags_input.setStyleSheet(
-        """
-        QLineEdit {
-            padding: 10px 16px;
-            border: 1px solid rgba(51, 65, 85, 0.3);
-            border-radius: 8px;
-            font-size: 13px;
-            color: #e2e8f0;
-            background: rgba(15, 23, 42, 0.6);
-        }
-        QLineEdit:focus {
-            border: 1px solid rgba(139, 92, 246, 0.5);
-            background: rgba(15, 23, 42, 0.8);
-            color: #f1f5f9;
-        }
-        """
-    )
-    tags_container.addWidget(main_window.tags_input)
-    meta_layout.addLayout(tags_container)
+    main_window.tags_input.textChanged.connect(main_window._schedule_content_changed)
+    main_window.tags_input.setObjectName('tagsInput')
+    _add_all(tags_container, tags_label, main_window.tags_input)
 
     main_window.lock_btn = QPushButton("Unlock")
     main_window.lock_btn.setFixedSize(40, 40)
     main_window.lock_btn.setCheckable(True)
     main_window.lock_btn.clicked.connect(main_window.toggle_lock_current)
-    main_window.lock_btn.setStyleSheet(
-        """
-        QPushButton { background: rgba(71,85,105,.3); color: #94a3b8; border: 1px solid rgba(71,85,105,.4); border-radius: 8px; font-size: 16px; }
-        QPushButton:checked { background: rgba(239,68,68,.3); color:#ef4444; border:1px solid rgba(239,68,68,.4); }
-        QPushButton:hover { background: rgba(59,130,246,.3); }
-        """
-    )
-    meta_layout.addWidget(main_window.lock_btn)
-    header_layout.addLayout(meta_layout)
-    layout.addWidget(header_container)
+    main_window.lock_btn.setObjectName('lockBtn')
+    _add_all(meta_layout, tags_container, main_window.lock_btn)
+    _add_all(header_layout, title_layout, meta_layout)
 
     # Toolbar
     toolbar_container = QWidget()
-    toolbar_container.setStyleSheet(
-        """
-        QWidget { background: rgba(30,41,59,.8); border: 1px solid rgba(51,65,85,.3); border-radius: 10px; padding: 8px 12px; }
-        """
-    )
+    toolbar_container.setObjectName('toolbarContainer')
     toolbar_layout = QHBoxLayout(toolbar_container)
     toolbar_layout.setSpacing(6)
 
     format_group = QHBoxLayout()
     fmt_label = QLabel("Format:")
-    fmt_label.setStyleSheet("color:#94a3b8;font-weight:500;font-size:12px;")
-    format_group.addWidget(fmt_label)
+    fmt_label.setObjectName('fieldLabel')
 
     main_window.format_combo = QComboBox()
     main_window.format_combo.addItems(["HTML", "Markdown"])
     main_window.format_combo.currentTextChanged.connect(main_window.on_format_changed)
-    main_window.format_combo.setStyleSheet(
-        """
-        QComboBox { background: rgba(15,23,42,.8); border: 1px solid rgba(51,65,85,.3); border-radius: 6px; padding: 4px 8px; color: #e2e8f0; font-weight: 500; min-width: 80px; }
-        QComboBox:focus { border: 1px solid rgba(59,130,246,.5); }
-        QComboBox::drop-down { border: none; }
-        QComboBox::down-arrow { image: none; border-left:4px solid transparent; border-right:4px solid transparent; border-top:4px solid #94a3b8; margin-right:6px; }
-        """
-    )
-    # Set default selection from settings
-    try:
-        default_fmt = (app_config.get('default_content_format', 'markdown') if app_config else 'markdown').lower()
-        main_window.format_combo.setCurrentText('Markdown' if default_fmt == 'markdown' else 'HTML')
-    except Exception:
-        main_window.format_combo.setCurrentText('Markdown')
-
-    format_group.addWidget(main_window.format_combo)
-    format_group.addWidget(QLabel("|"))
-    toolbar_layout.addLayout(format_group)
-
-    formatting_buttons = [
-        ("B", "Bold", main_window.toggle_bold, None),
-        ("I", "Italic", main_window.toggle_italic, None),
-        ("U", "Underline", main_window.toggle_underline, None),
-        ("", "sep", None, None),
-        ("◄", "Align Left", lambda: main_window.set_alignment(Qt.AlignmentFlag.AlignLeft), None),
-        ("■", "Center", lambda: main_window.set_alignment(Qt.AlignmentFlag.AlignCenter), None), 
-        ("►", "Align Right", lambda: main_window.set_alignment(Qt.AlignmentFlag.AlignRight), None),
-        ("", "sep", None, None),
-        ("Link", "Insert Link", main_window.insert_link, None),
-        ("Img", "Insert Image", main_window.insert_image, None),
-        ("Code", "Insert Code", main_window.insert_code_block, None),
-    ]
-
-    main_window.format_buttons = {}
-    for text, tooltip, action, icon_type in formatting_buttons:
-        if text == "":
-            sep = QLabel("•")
-            sep.setStyleSheet("color:#475569;font-size:14px;margin:0 4px;")
-            toolbar_layout.addWidget(sep)
+    main_window.format_combo.setObjectName('formatCombo')
+    # Set default selection from settings; no note is loaded yet, so don't notify
+    with QSignalBlocker(main_window.format_combo):
+        try:
+            default_fmt = (app_config.get('default_content_format', 'markdown') if app_config else 'markdown').lower()
+            main_window.format_combo.setCurrentText('Markdown' if default_fmt == 'markdown' else 'HTML')
+        except Exception:
+            main_window.format_combo.setCurrentText('Markdown')
+
+    _add_all(format_group, fmt_label, main_window.format_combo, _make_separator())
+
+    toolbar_items = [format_group]
+    for spec in _FMT_SPEC:
+        if spec is None:
+            toolbar_items.append(_make_separator())
             continue
+        text, tooltip, method_name, arg = spec
+        action = getattr(main_window, method_name)
+        if arg is not None:
+            action = partial(action, arg)
         btn = QPushButton(text)
         btn.setFixedSize(40, 32)
         btn.setToolTip(tooltip)
         
         # Keep text labels - they're clearer than confusing icons
-        if text in ["B", "I", "U"]:
+        toggle_attr = _TOGGLE_BUTTON_ATTRS.get(text)
+        if toggle_attr:
             btn.setCheckable(True)
-            main_window.format_buttons[text] = btn
-        if action:
-            btn.clicked.connect(action)
-        btn.setStyleSheet(
-            """
-            QPushButton { 
-                background: rgba(71,85,105,.3); 
-                color: #e2e8f0; 
-                border: 1px solid rgba(71,85,105,.4); 
-                border-radius: 6px; 
-                font-weight: 600; 
-                font-size: 11px; 
-                font-family: 'Segoe UI', system-ui, sans-serif;
-                min-width: 36px; 
-                min-height: 28px; 
-            }
-            QPushButton:checked { 
-                background: rgba(59,130,246,.4); 
-                color: #ffffff; 
-                border: 1px solid rgba(59,130,246,.6); 
-            }
-            QPushButton:hover { 
-                background: rgba(71,85,105,.5); 
-                color: #f1f5f9; 
-                border: 1px solid rgba(71,85,105,.6);
-            }
-            QPushButton:pressed {
-                background: rgba(59,130,246,.3);
-            }
-            """
-        )
-        toolbar_layout.addWidget(btn)
-
-    toolbar_layout.addStretch()
+            setattr(main_window, toggle_attr, btn)
+        btn.clicked.connect(action)
+        btn.setObjectName('fmtBtn')
+        toolbar_items.append(btn)
 
     size_controls = QHBoxLayout()
     size_label = QLabel("Size:")
-    size_label.setStyleSheet("color:#94a3b8;font-weight:500;font-size:12px;")
-    size_controls.addWidget(size_label)
+    size_label.setObjectName('fieldLabel')
     size_down_btn = QPushButton("A-")
     size_down_btn.setToolTip("Decrease font size")
     size_down_btn.setFixedSize(32, 28)
-    size_down_btn.clicked.connect(lambda: main_window.content_editor.zoomOut(1))
     size_up_btn = QPushButton("A+")
     size_up_btn.setToolTip("Increase font size")
     size_up_btn.setFixedSize(32, 28)
-    size_up_btn.clicked.connect(lambda: main_window.content_editor.zoomIn(1))
     for b in [size_down_btn, size_up_btn]:
-        b.setStyleSheet(
-            """
-            QPushButton { 
-                background: rgba(71,85,105,.3); 
-                color: #e2e8f0; 
-                border: 1px solid rgba(71,85,105,.4); 
-                border-radius: 6px; 
-                font-weight: 600; 
-                font-size: 10px; 
-                font-family: 'Segoe UI', system-ui, sans-serif;
-            }
-            QPushButton:hover { 
-                background: rgba(71,85,105,.4); 
-                color: #f1f5f9; 
-            }
-            """
-        )
-    size_controls.addWidget(size_down_btn)
-    size_controls.addWidget(size_up_btn)
-    toolbar_layout.addLayout(size_controls)
-    layout.addWidget(toolbar_container)
+        b.setObjectName('sizeBtn')
+    _add_all(size_controls, size_label, size_down_btn, size_up_btn)
+    _add_all(toolbar_layout, *toolbar_items, None, size_controls)
 
     # Tabs and editors
     main_window.editor_tabs = QTabWidget()
-    main_window.editor_tabs.setStyleSheet(
-        """
-        QTabWidget::pane { border: 1px solid rgba(51,65,85,.3); border-radius: 12px; background: rgba(30,41,59,.6); padding: 0px; }
-        QTabBar::tab { background: rgba(71,85,105,.3); color:#94a3b8; padding: 12px 24px; margin: 2px; border-radius: 8px; font-weight: 600; font-size: 13px; border: 1px solid rgba(71,85,105,.4); min-width: 80px; }
-        QTabBar::tab:selected { background: rgba(59,130,246,.3); color:#93c5fd; border: 1px solid rgba(59,130,246,.4); }
-        QTabBar::tab:hover:!selected { background: rgba(71,85,105,.4); color:#cbd5e1; }
-        """
-    )
+    main_window.editor_tabs.setObjectName('editorTabs')
 
     edit_tab = QWidget()
     edit_layout = QVBoxLayout(edit_tab)
     edit_layout.setContentsMargins(16, 16, 16, 16)
     main_window.content_editor = QTextEdit()
-    main_window.content_editor.textChanged.connect(main_window.on_content_changed)
+    main_window.content_editor.textChanged.connect(main_window._schedule_content_changed)
     main_window.content_editor.cursorPositionChanged.connect(main_window.update_format_buttons)
-    main_window.content_editor.setFont(QFont("Segoe UI", 14))
-    main_window.content_editor.setStyleSheet(
-        """
-        QTextEdit { border: 1px solid rgba(51,65,85,.3); border-radius: 12px; padding: 24px; background: rgba(15,23,42,.8); color:#f1f5f9; line-height: 1.6; font-family: 'Segoe UI', system-ui, sans-serif; font-weight: 400; font-size: 14px; selection-background-color: rgba(59,130,246,.3); selection-color: #bfdbfe; }
-        QTextEdit:focus { border: 1px solid rgba(59,130,246,.5); background: rgba(15,23,42,.9); }
-        QScrollBar:vertical { background: rgba(15,23,42,.4); width: 12px; border-radius: 6px; margin: 0px; }
-        QScrollBar::handle:vertical { background: rgba(71,85,105,.6); border-radius: 6px; min-height: 20px; margin: 2px; }
-        QScrollBar::handle:vertical:hover { background: rgba(59,130,246,.6); }
-        QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical { height: 0px; }
-        """
-    )
+    main_window.content_editor.setFont(_get_editor_font())
+    main_window.content_editor.setObjectName('contentEditor')
+    size_down_btn.clicked.connect(partial(main_window.content_editor.zoomOut, 1))
+    size_up_btn.clicked.connect(partial(main_window.content_editor.zoomIn, 1))
     edit_layout.addWidget(main_window.content_editor)
     main_window.editor_tabs.addTab(edit_tab, "Edit")
 
     preview_tab = QWidget()
-    preview_layout = QVBoxLayout(preview_tab)
-    preview_layout.setContentsMargins(0, 0, 0, 0)
-    if QWebEngineView is not None:
-        main_window.preview_view = QWebEngineView()
-        main_window.preview_view.setStyleSheet(
-            """
-            QWebEngineView { border: 1px solid rgba(51,65,85,.3); border-radius: 12px; background: rgba(15,23,42,.8); }
-            """
-        )
-    else:
-        main_window.preview_view = QTextEdit()
-        main_window.preview_view.setReadOnly(True)
-        main_window.preview_view.setStyleSheet(
-            """
-            QTextEdit { border: 1px solid rgba(51,65,85,.3); border-radius: 12px; padding: 24px; background: rgba(15,23,42,.8); color:#f1f5f9; font-family: 'Segoe UI', system-ui, sans-serif; font-size: 14px; line-height: 1.6; }
-            """
-        )
-    preview_layout.addWidget(main_window.preview_view)
+    main_window._preview_layout = QVBoxLayout(preview_tab)
+    main_window._preview_layout.setContentsMargins(0, 0, 0, 0)
+    # The real preview widget is built by create_preview_view on the first visit to the tab
+    main_window._preview_placeholder = QLabel("Loading preview…")
+    main_window._preview_placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+    main_window._preview_layout.addWidget(main_window._preview_placeholder)
+    main_window.preview_view = None
+    main_window._preview_built = False
     main_window.editor_tabs.addTab(preview_tab, "Preview")
 
     main_window.editor_tabs.currentChanged.connect(main_window.on_tab_changed)
-    layout.addWidget(main_window.editor_tabs)
 
     actions_container = QWidget()
-    actions_container.setStyleSheet(
-        """
-        QWidget { background: rgba(30,41,59,.8); border: 1px solid rgba(51,65,85,.3); border-radius: 10px; padding: 12px 16px; }
-        """
-    )
+    actions_container.setObjectName('actionsContainer')
     actions_layout = QHBoxLayout(actions_container)
     actions_layout.setSpacing(12)
     main_window.word_count_label = QLabel("0 words")
-    main_window.word_count_label.setStyleSheet(
-        """
-        QLabel { color:#64748b; font-weight:500; font-size:12px; background: rgba(15,23,42,.6); padding: 6px 12px; border:1px solid rgba(51,65,85,.3); border-radius: 6px; }
-        """
-    )
-    actions_layout.addWidget(main_window.word_count_label)
-    actions_layout.addStretch()
+    main_window.word_count_label.setObjectName('wordCount')
     main_window.save_btn = QPushButton("Save Note")
     main_window.save_btn.clicked.connect(main_window.save_note)
     main_window.save_btn.setEnabled(False)
     try:
-        main_window.save_btn.setIcon(main_window.style().standardIcon(main_window.style().StandardPixmap.SP_DialogSaveButton))
-        main_window.save_btn.setIconSize(main_window.save_btn.iconSize())
+        main_window.save_btn.setIcon(_get_save_icon(main_window))
     except Exception:
         pass
-    main_window.save_btn.setStyleSheet(
-        """
-        QPushButton { background: qlineargradient(x1:0,y1:0,x2:1,y2:1, stop:0 rgba(34,197,94,.3), stop:1 rgba(59,130,246,.2)); color:#22c55e; border:1px solid rgba(34,197,94,.4); padding:10px 20px; border-radius:8px; font-weight:600; font-size:12px; min-height:20px; }
-        QPushButton:hover:enabled { background: qlineargradient(x1:0,y1:0,x2:1,y2:1, stop:0 rgba(34,197,94,.4), stop:1 rgba(59,130,246,.3)); color:#4ade80; border:1px solid rgba(34,197,94,.5); }
-        QPushButton:pressed:enabled { background: qlineargradient(x1:0,y1:0,x2:1,y2:1, stop:0 rgba(34,197,94,.5), stop:1 rgba(59,130,246,.4)); }
-        QPushButton:disabled { background: rgba(71,85,105,.2); color:#64748b; border:1px solid rgba(71,85,105,.3); }
-        """
-    )
-    actions_layout.addWidget(main_window.save_btn)
-    layout.addWidget(actions_container)
-    
+    main_window.save_btn.setObjectName('saveBtn')
+    _add_all(actions_layout, main_window.word_count_label, None, main_window.save_btn)
+
+    _add_all(layout, header_container, toolbar_container, main_window.editor_tabs, actions_container)
+
     # Set responsive size constraints
     panel.setMinimumWidth(400)  # Minimum width for usable editing
-    
+
+    main_window._right_panel = panel
     return panel
+
+
+def create_preview_view(main_window):
+    """Build the preview widget in place of its placeholder; a web view starts a Chromium renderer"""
+    if main_window._preview_built:
+        return main_window.preview_view
+
+    if QWebEngineView is not None:
+        view = QWebEngineView()
+        view.loadFinished.connect(main_window._on_preview_load_finished)
+    else:
+        view = QTextEdit()
+        view.setReadOnly(True)
+    view.setObjectName('previewView')
+
+    layout = main_window._preview_layout
+    layout.removeWidget(main_window._preview_placeholder)
+    main_window._preview_placeholder.deleteLater()
+    main_window._preview_placeholder = None
+    layout.addWidget(view)
+    view.show()
+
+    main_window.preview_view = view
+    main_window._preview_built = True
+    # Whatever was "last rendered" went to the placeholder; the new view starts empty
+    main_window._preview_shell_state = None
+    main_window._last_preview_key = None
+    return view
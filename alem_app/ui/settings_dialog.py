@@ -1,115 +1,118 @@
+from pathlib import Path
 
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont
 from PyQt6.QtWidgets import (
     QCheckBox, QComboBox, QDialog, QFormLayout, QGroupBox, QHBoxLayout, QLabel, QLineEdit, QPushButton, QSpinBox, QTabWidget, QVBoxLayout, QWidget
 )
 
-from config import config as app_config
+from config import DEFAULT_SETTINGS, config as app_config
+
+_THEMES = ("dark", "light")
+_FONT_FAMILIES = ("Segoe UI", "Arial", "Helvetica", "Times New Roman", "Consolas")
+_CONTENT_FORMATS = ("html", "markdown")
+
+_TITLE_FONT = None
+
+
+def _get_title_font() -> QFont:
+    """Shared dialog title font; created on first use since QFont needs a QApplication"""
+    global _TITLE_FONT
+    if _TITLE_FONT is None:
+        _TITLE_FONT = QFont("Segoe UI", 18, QFont.Weight.Bold)
+    return _TITLE_FONT
+
+
+def _make_combo(items) -> QComboBox:
+    """Fixed-choice combo box; sized from its minimum contents length, not every item"""
+    combo = QComboBox()
+    combo.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
+    combo.setSizeAdjustPolicy(QComboBox.SizeAdjustPolicy.AdjustToMinimumContentsLengthWithIcon)
+    combo.addItems(items)
+    return combo
+
+
+# Binding kind -> (getter, setter) on the bound widget
+_ACCESSORS = {
+    'combo': (QComboBox.currentText, QComboBox.setCurrentText),
+    'text': (QLineEdit.text, QLineEdit.setText),
+    'int': (QSpinBox.value, QSpinBox.setValue),
+    'bool': (QCheckBox.isChecked, QCheckBox.setChecked),
+}
+
+# Per-tab (setting key, widget attribute on SettingsDialog, kind, default)
+_GENERAL_BINDINGS = (
+    ('theme', 'theme_combo', 'combo', 'dark'),
+    ('font_family', 'font_family_combo', 'combo', 'Segoe UI'),
+    ('font_size', 'font_size_spin', 'int', 13),
+    ('auto_save_interval', 'auto_save_spin', 'int', 30000),
+    ('search_debounce_delay', 'search_delay_spin', 'int', 300),
+    ('max_search_results', 'max_results_spin', 'int', 100),
+)
+_EDITOR_BINDINGS = (
+    ('default_content_format', 'default_format_combo', 'combo', 'html'),
+    ('ai_search_enabled', 'ai_search_check', 'bool', True),
+    ('ai_model_cache', 'model_cache_check', 'bool', True),
+)
+_ADVANCED_BINDINGS = (
+    # Redis
+    ('redis_enabled', 'redis_enabled_check', 'bool', True),
+    ('redis_host', 'redis_host_edit', 'text', 'localhost'),
+    ('redis_port', 'redis_port_spin', 'int', 6379),
+    ('redis_db', 'redis_db_spin', 'int', 0),
+    ('redis_flush_interval_s', 'redis_flush_spin', 'int', 60),
+    # Security
+    ('kdf_iterations', 'kdf_iterations_spin', 'int', 390000),
+    ('argon2_time_cost', 'argon2_time_spin', 'int', 3),
+    ('argon2_memory_cost', 'argon2_memory_spin', 'int', 65536),
+    ('argon2_parallelism', 'argon2_parallelism_spin', 'int', 4),
+    ('kdf_cache_enabled', 'kdf_cache_check', 'bool', True),
+    # AI Keys
+    ('groq_api_key', 'groq_api_key_edit', 'text', ''),
+    ('nvidia_api_key', 'nvidia_api_key_edit', 'text', ''),
+    ('glm_api_key', 'glm_api_key_edit', 'text', ''),
+)
+_DISCORD_BINDINGS = (
+    ('discord_rpc_enabled', 'discord_enabled_check', 'bool', True),
+    ('discord_client_id', 'discord_client_id_edit', 'text', ''),
+    ('discord_large_image', 'discord_large_image_edit', 'text', 'alem'),
+    ('discord_large_text', 'discord_large_text_edit', 'text', 'Alem - Smart Notes'),
+    ('discord_update_interval_s', 'discord_update_spin', 'int', 15),
+)
+
+# Glassmorphism theme for the dialog and everything in it, shipped next to this module
+_SETTINGS_QSS_PATH = Path(__file__).with_name("settings.qss")
 
 
 class SettingsDialog(QDialog):
     """Modern Settings Dialog with Glassmorphism Design"""
 
+    _QSS = None  # stylesheet text, read from disk by the first dialog
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Alem Settings")
         self.setModal(True)
         self.setMinimumSize(600, 500)
         self.settings_changed = False
+        self._loaded = False  # widgets hold stored values; filled one tick after first show
 
         # Apply glassmorphism style
-        self.setStyleSheet("""
-            QDialog {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 rgba(15, 23, 42, 0.95), stop:1 rgba(30, 41, 59, 0.95));
-                border: 1px solid rgba(51, 65, 85, 0.3);
-                border-radius: 16px;
-            }
-            QTabWidget::pane {
-                border: 1px solid rgba(51, 65, 85, 0.3);
-                border-radius: 12px;
-                background: rgba(30, 41, 59, 0.6);
-                padding: 16px;
-            }
-            QTabBar::tab {
-                background: rgba(71, 85, 105, 0.3);
-                color: #94a3b8;
-                padding: 12px 20px;
-                margin: 2px;
-                border-radius: 8px;
-                font-weight: 500;
-                border: 1px solid rgba(71, 85, 105, 0.4);
-            }
-            QTabBar::tab:selected {
-                background: rgba(59, 130, 246, 0.2);
-                color: #93c5fd;
-                border: 1px solid rgba(59, 130, 246, 0.3);
-            }
-            QGroupBox {
-                color: #e2e8f0;
-                font-weight: 600;
-                border: 1px solid rgba(51, 65, 85, 0.3);
-                border-radius: 8px;
-                margin-top: 12px;
-                padding-top: 16px;
-                background: rgba(15, 23, 42, 0.4);
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 16px;
-                padding: 0 8px 0 8px;
-                color: #f1f5f9;
-            }
-            QLabel {
-                color: #cbd5e1;
-                font-weight: 500;
-            }
-            QLineEdit, QSpinBox, QComboBox {
-                background: rgba(30, 41, 59, 0.8);
-                border: 1px solid rgba(51, 65, 85, 0.3);
-                border-radius: 6px;
-                padding: 8px 12px;
-                color: #e2e8f0;
-                font-weight: 400;
-            }
-            QLineEdit:focus, QSpinBox:focus, QComboBox:focus {
-                border: 1px solid rgba(59, 130, 246, 0.5);
-                background: rgba(30, 41, 59, 0.9);
-            }
-            QCheckBox {
-                color: #cbd5e1;
-                font-weight: 500;
-            }
-            QCheckBox::indicator {
-                width: 18px;
-                height: 18px;
-                border-radius: 4px;
-                border: 1px solid rgba(51, 65, 85, 0.5);
-                background: rgba(30, 41, 59, 0.6);
-            }
-            QCheckBox::indicator:checked {
-                background: rgba(59, 130, 246, 0.3);
-                border: 1px solid rgba(59, 130, 246, 0.5);
-            }
-            QPushButton {
-                background: rgba(59, 130, 246, 0.2);
-                color: #3b82f6;
-                border: 1px solid rgba(59, 130, 246, 0.3);
-                padding: 10px 20px;
-                border-radius: 8px;
-                font-weight: 600;
-            }
-            QPushButton:hover {
-                background: rgba(59, 130, 246, 0.3);
-                color: #60a5fa;
-            }
-            QPushButton:pressed {
-                background: rgba(59, 130, 246, 0.4);
-            }
-        """)
+        self.setObjectName("AlemSettingsDialog")
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
+        self.setStyleSheet(self._stylesheet())
 
         self.setup_ui()
-        self.load_current_settings()
+
+    @classmethod
+    def _stylesheet(cls) -> str:
+        if cls._QSS is None:
+            try:
+                cls._QSS = _SETTINGS_QSS_PATH.read_text(encoding='utf-8')
+            except OSError as e:
+                print(f"Warning: Could not load settings stylesheet: {e}")
+                cls._QSS = ""
+        return cls._QSS
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -117,29 +120,27 @@ class SettingsDialog(QDialog):
 
         # Title
         title = QLabel("Settings")
-        title.setFont(QFont("Segoe UI", 18, QFont.Weight.Bold))
-        title.setStyleSheet("color: #f1f5f9; margin-bottom: 16px;")
+        title.setFont(_get_title_font())
+        title.setObjectName("settingsTitle")
         layout.addWidget(title)
 
-        # Create tabs
-        tabs = QTabWidget()
-        layout.addWidget(tabs)
-
-        # General tab
-        general_tab = self.create_general_tab()
-        tabs.addTab(general_tab, "General")
-
-        # Editor tab
-        editor_tab = self.create_editor_tab()
-        tabs.addTab(editor_tab, "Editor")
-
-        # Advanced tab
-        advanced_tab = self.create_advanced_tab()
-        tabs.addTab(advanced_tab, "Advanced")
-
-        # Discord tab
-        discord_tab = self.create_discord_tab()
-        tabs.addTab(discord_tab, "Discord RPC")
+        # Create tabs; each one's widgets are built the first time it is shown
+        self.tabs = QTabWidget()
+        layout.addWidget(self.tabs)
+        self._tab_builders = {}
+        self._bindings = []  # bindings of every materialized tab
+        self._md_checks = ()  # (extension name, checkbox) once the Editor tab exists
+        for label, build, bindings in (
+            ("General", self.create_general_tab, _GENERAL_BINDINGS),
+            ("Editor", self.create_editor_tab, _EDITOR_BINDINGS),
+            ("Advanced", self.create_advanced_tab, _ADVANCED_BINDINGS),
+            ("Discord RPC", self.create_discord_tab, _DISCORD_BINDINGS),
+        ):
+            page = QWidget()
+            QVBoxLayout(page).setContentsMargins(0, 0, 0, 0)
+            self._tab_builders[self.tabs.addTab(page, label)] = (build, bindings)
+        self.tabs.currentChanged.connect(self._materialize_tab)
+        self._materialize_tab(self.tabs.currentIndex())
 
         # Buttons
         button_layout = QHBoxLayout()
@@ -155,6 +156,17 @@ class SettingsDialog(QDialog):
 
         layout.addLayout(button_layout)
 
+    def _materialize_tab(self, index: int):
+        """Build a tab's widgets into its placeholder page and load its settings"""
+        spec = self._tab_builders.pop(index, None)
+        if spec is None:
+            return
+        build, bindings = spec
+        self.tabs.widget(index).layout().addWidget(build())
+        self._bindings.extend(bindings)
+        if app_config and self._loaded:
+            self._populate(bindings, self._md_checks if bindings is _EDITOR_BINDINGS else ())
+
     def create_general_tab(self):
         widget = QWidget()
         layout = QVBoxLayout(widget)
@@ -163,12 +175,10 @@ class SettingsDialog(QDialog):
         ui_group = QGroupBox("User Interface")
         ui_layout = QFormLayout(ui_group)
 
-        self.theme_combo = QComboBox()
-        self.theme_combo.addItems(["dark", "light"])
+        self.theme_combo = _make_combo(_THEMES)
         ui_layout.addRow("Theme:", self.theme_combo)
 
-        self.font_family_combo = QComboBox()
-        self.font_family_combo.addItems(["Segoe UI", "Arial", "Helvetica", "Times New Roman", "Consolas"])
+        self.font_family_combo = _make_combo(_FONT_FAMILIES)
         ui_layout.addRow("Font Family:", self.font_family_combo)
 
         self.font_size_spin = QSpinBox()
@@ -208,8 +218,7 @@ class SettingsDialog(QDialog):
         editor_group = QGroupBox("Editor Options")
         editor_layout = QFormLayout(editor_group)
 
-        self.default_format_combo = QComboBox()
-        self.default_format_combo.addItems(["html", "markdown"])
+        self.default_format_combo = _make_combo(_CONTENT_FORMATS)
         editor_layout.addRow("Default Format:", self.default_format_combo)
 
         self.ai_search_check = QCheckBox("Enable AI Search")
@@ -229,7 +238,13 @@ class SettingsDialog(QDialog):
         self.toc_check = QCheckBox("Table of Contents")
         self.codehilite_check = QCheckBox("Code Highlighting")
 
-        for check in [self.fenced_code_check, self.tables_check, self.toc_check, self.codehilite_check]:
+        self._md_checks = (
+            ('fenced_code', self.fenced_code_check),
+            ('tables', self.tables_check),
+            ('toc', self.toc_check),
+            ('codehilite', self.codehilite_check),
+        )
+        for _, check in self._md_checks:
             md_layout.addWidget(check)
 
         layout.addWidget(md_group)
@@ -275,6 +290,25 @@ class SettingsDialog(QDialog):
         self.kdf_iterations_spin.setSuffix(" iterations")
         security_layout.addRow("KDF Iterations:", self.kdf_iterations_spin)
 
+        self.argon2_time_spin = QSpinBox()
+        self.argon2_time_spin.setRange(1, 10)
+        self.argon2_time_spin.setSuffix(" passes")
+        security_layout.addRow("Argon2 Time Cost:", self.argon2_time_spin)
+
+        self.argon2_memory_spin = QSpinBox()
+        self.argon2_memory_spin.setRange(8192, 1048576)
+        self.argon2_memory_spin.setSingleStep(8192)
+        self.argon2_memory_spin.setSuffix(" KiB")
+        security_layout.addRow("Argon2 Memory:", self.argon2_memory_spin)
+
+        self.argon2_parallelism_spin = QSpinBox()
+        self.argon2_parallelism_spin.setRange(1, 16)
+        self.argon2_parallelism_spin.setSuffix(" lanes")
+        security_layout.addRow("Argon2 Parallelism:", self.argon2_parallelism_spin)
+
+        self.kdf_cache_check = QCheckBox("Remember unlocked notes' keys this session")
+        security_layout.addRow("", self.kdf_cache_check)
+
         layout.addWidget(security_group)
 
         # AI Keys Settings
@@ -328,110 +362,56 @@ class SettingsDialog(QDialog):
 
         # Info
         info_label = QLabel("💡 Configure Discord RPC to show your activity while using Alem")
-        info_label.setStyleSheet("color: #64748b; font-style: italic; margin-top: 16px;")
+        info_label.setObjectName("settingsInfo")
         layout.addWidget(info_label)
 
         layout.addStretch()
         return widget
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._loaded:
+            # Let the window paint once before filling in the widgets
+            QTimer.singleShot(0, self._ensure_loaded)
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.load_current_settings()
+
     def load_current_settings(self):
-        """Load current settings into the dialog"""
+        """Load current settings into the tabs built so far"""
         if not app_config:
             return
-
-        # General
-        self.theme_combo.setCurrentText(app_config.get('theme', 'dark'))
-        self.font_family_combo.setCurrentText(app_config.get('font_family', 'Segoe UI'))
-        self.font_size_spin.setValue(app_config.get('font_size', 13))
-        self.auto_save_spin.setValue(app_config.get('auto_save_interval', 30000))
-        self.search_delay_spin.setValue(app_config.get('search_debounce_delay', 300))
-        self.max_results_spin.setValue(app_config.get('max_search_results', 100))
-
-        # Editor
-        self.default_format_combo.setCurrentText(app_config.get('default_content_format', 'html'))
-        self.ai_search_check.setChecked(app_config.get('ai_search_enabled', True))
-        self.model_cache_check.setChecked(app_config.get('ai_model_cache', True))
-
-        # Markdown
-        extensions = app_config.get('markdown_extensions', [])
-        self.fenced_code_check.setChecked('fenced_code' in extensions)
-        self.tables_check.setChecked('tables' in extensions)
-        self.toc_check.setChecked('toc' in extensions)
-        self.codehilite_check.setChecked('codehilite' in extensions)
-
-        # Redis
-        self.redis_enabled_check.setChecked(app_config.get('redis_enabled', True))
-        self.redis_host_edit.setText(app_config.get('redis_host', 'localhost'))
-        self.redis_port_spin.setValue(app_config.get('redis_port', 6379))
-        self.redis_db_spin.setValue(app_config.get('redis_db', 0))
-        self.redis_flush_spin.setValue(app_config.get('redis_flush_interval_s', 60))
-
-        # Security
-        self.kdf_iterations_spin.setValue(app_config.get('kdf_iterations', 390000))
-
-        # AI Keys
-        self.groq_api_key_edit.setText(app_config.get('groq_api_key', ''))
-        self.nvidia_api_key_edit.setText(app_config.get('nvidia_api_key', ''))
-        self.glm_api_key_edit.setText(app_config.get('glm_api_key', ''))
-
-        # Discord
-        self.discord_enabled_check.setChecked(app_config.get('discord_rpc_enabled', True))
-        self.discord_client_id_edit.setText(app_config.get('discord_client_id', ''))
-        self.discord_large_image_edit.setText(app_config.get('discord_large_image', 'alem'))
-        self.discord_large_text_edit.setText(app_config.get('discord_large_text', 'Alem - Smart Notes'))
-        self.discord_update_spin.setValue(app_config.get('discord_update_interval_s', 15))
+        self._populate(self._bindings, self._md_checks)
+        self._loaded = True
+
+    def _populate(self, bindings, md_checks):
+        """Fill bound widgets from one settings snapshot with repaints held off"""
+        settings = app_config.snapshot()
+        self.setUpdatesEnabled(False)
+        try:
+            for key, attr, kind, default in bindings:
+                _ACCESSORS[kind][1](getattr(self, attr), settings.get(key, default))
+            extensions = set(settings.get('markdown_extensions', ()))
+            for name, check in md_checks:
+                check.setChecked(name in extensions)
+        finally:
+            self.setUpdatesEnabled(True)
 
     def save_settings(self):
-        """Save settings and apply changes"""
+        """Save settings and apply changes; tabs never opened keep their stored values"""
         if not app_config:
             return
-
-        # General
-        app_config.set('theme', self.theme_combo.currentText())
-        app_config.set('font_family', self.font_family_combo.currentText())
-        app_config.set('font_size', self.font_size_spin.value())
-        app_config.set('auto_save_interval', self.auto_save_spin.value())
-        app_config.set('search_debounce_delay', self.search_delay_spin.value())
-        app_config.set('max_search_results', self.max_results_spin.value())
-
-        # Editor
-        app_config.set('default_content_format', self.default_format_combo.currentText())
-        app_config.set('ai_search_enabled', self.ai_search_check.isChecked())
-        app_config.set('ai_model_cache', self.model_cache_check.isChecked())
-
-        # Markdown extensions
-        extensions = []
-        if self.fenced_code_check.isChecked():
-            extensions.append('fenced_code')
-        if self.tables_check.isChecked():
-            extensions.append('tables')
-        if self.toc_check.isChecked():
-            extensions.append('toc')
-        if self.codehilite_check.isChecked():
-            extensions.append('codehilite')
-        app_config.set('markdown_extensions', extensions)
-
-        # Redis
-        app_config.set('redis_enabled', self.redis_enabled_check.isChecked())
-        app_config.set('redis_host', self.redis_host_edit.text())
-        app_config.set('redis_port', self.redis_port_spin.value())
-        app_config.set('redis_db', self.redis_db_spin.value())
-        app_config.set('redis_flush_interval_s', self.redis_flush_spin.value())
-
-        # Security
-        app_config.set('kdf_iterations', self.kdf_iterations_spin.value())
-
-        # AI Keys
-        app_config.set('groq_api_key', self.groq_api_key_edit.text())
-        app_config.set('nvidia_api_key', self.nvidia_api_key_edit.text())
-        app_config.set('glm_api_key', self.glm_api_key_edit.text())
-
-        # Discord
-        app_config.set('discord_rpc_enabled', self.discord_enabled_check.isChecked())
-        app_config.set('discord_client_id', self.discord_client_id_edit.text())
-        app_config.set('discord_large_image', self.discord_large_image_edit.text())
-        app_config.set('discord_large_text', self.discord_large_text_edit.text())
-        app_config.set('discord_update_interval_s', self.discord_update_spin.value())
+        self._ensure_loaded()
+        updates = {key: _ACCESSORS[kind][0](getattr(self, attr)) for key, attr, kind, _ in self._bindings}
+        if self._md_checks:
+            # Keep the default's order (extension order matters to markdown) so an untouched list
+            # compares equal to the default and is not persisted as an override
+            order = DEFAULT_SETTINGS['markdown_extensions']
+            checked = [name for name, check in self._md_checks if check.isChecked()]
+            checked.sort(key=lambda name: order.index(name) if name in order else len(order))
+            updates['markdown_extensions'] = checked
+        app_config.update(updates, background=True)
 
         self.settings_changed = True
         self.accept()
@@ -1,58 +1,150 @@
 
 import base64
+import binascii
+import hashlib
 import json
 import os as _os
-from typing import Optional
+from functools import lru_cache
 
-from cryptography.fernet import Fernet, InvalidToken
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
+try:
+    from argon2.low_level import Type as Argon2Type, hash_secret_raw
+except ImportError:
+    Argon2Type = hash_secret_raw = None
 
-def _derive_key(password: str, salt: bytes, iterations: int = 390000) -> Optional[bytes]:
-    """Derive a Fernet-compatible key from a password and salt."""
-    if PBKDF2HMAC is None or base64 is None:
-        return None
-    kdf = PBKDF2HMAC(
-        algorithm=hashes.SHA256(),
-        length=32,
-        salt=salt,
-        iterations=iterations,
-        backend=default_backend(),
-    )
-    key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
-    return key
+from config import config as app_config
 
+ALG_PBKDF2 = 'fernet-pbkdf2'
+ALG_ARGON2ID = 'argon2id-v19'
 
-def encrypt_content(plain_text: str, password: str, iterations: int) -> str:
-    """Encrypt content; returns JSON string containing metadata and ciphertext."""
-    if Fernet is None:
+_URLSAFE_TRANS = bytes.maketrans(b'+/', b'-_')
+
+# (Fernet, InvalidToken) once loaded, False if cryptography is missing
+_fernet_api = None
+
+
+def _get_fernet():
+    """Return cryptography's (Fernet, InvalidToken), importing them on first use"""
+    global _fernet_api
+    if _fernet_api is None:
+        try:
+            from cryptography.fernet import Fernet, InvalidToken
+            _fernet_api = (Fernet, InvalidToken)
+        except ImportError:
+            _fernet_api = False
+    if not _fernet_api:
         raise RuntimeError("Encryption support not available. Install 'cryptography'.")
+    return _fernet_api
+
+
+def _urlsafe_b64(raw: bytes) -> bytes:
+    """base64.urlsafe_b64encode without the module's per-call wrapper work."""
+    return binascii.b2a_base64(raw, newline=False).translate(_URLSAFE_TRANS)
+
+
+def _derive_key(password: str, salt: bytes, iterations: int = 390000) -> bytes:
+    """Derive a Fernet-compatible key from a password and salt (PBKDF2-HMAC-SHA256)."""
+    dk = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations, dklen=32)
+    return _urlsafe_b64(dk)
+
+
+def _derive_key_argon2(password: str, salt: bytes, time_cost: int, memory_cost: int, parallelism: int) -> bytes:
+    """Derive a Fernet-compatible key with Argon2id (memory_cost in KiB)."""
+    dk = hash_secret_raw(password.encode('utf-8'), salt, time_cost=time_cost, memory_cost=memory_cost,
+                         parallelism=parallelism, hash_len=32, type=Argon2Type.ID)
+    return _urlsafe_b64(dk)
+
+
+# Payload 'alg' -> key derivation taking (password, salt, *params)
+_KDFS = {
+    ALG_PBKDF2: _derive_key,
+    ALG_ARGON2ID: _derive_key_argon2,
+}
+
+
+def _decode_salt(text: str) -> bytes:
+    """Salts are hex; payloads written before that carry 24-char urlsafe base64."""
+    if len(text) == 32:
+        return bytes.fromhex(text)
+    return base64.urlsafe_b64decode(text)
+
+
+def _derive(alg: str, password: str, salt: bytes, params: tuple) -> bytes:
+    return _KDFS[alg](password, salt, *params)
+
+
+# Session memo so reopening a locked note skips the KDF; it keeps passwords in
+# memory, so it is small and can be turned off with 'kdf_cache_enabled'
+_derive_cached = lru_cache(maxsize=32)(_derive)
+
+
+def _get_key(alg: str, password: str, salt: bytes, params: tuple) -> bytes:
+    if app_config.get('kdf_cache_enabled', True):
+        return _derive_cached(alg, password, salt, params)
+    return _derive(alg, password, salt, params)
+
+
+def encryption_available() -> bool:
+    """Whether cryptography can be imported (imports it on first call)."""
+    try:
+        _get_fernet()
+    except RuntimeError:
+        return False
+    return True
+
+
+def clear_key_cache():
+    """Forget every key derived this session."""
+    _derive_cached.cache_clear()
+
+
+def encrypt_content(plain_text: str, password: str, iterations: int) -> str:
+    """Encrypt content; returns JSON string containing metadata and ciphertext.
+
+    Uses Argon2id when argon2-cffi is installed, otherwise PBKDF2 with the given iterations.
+    """
+    Fernet, _ = _get_fernet()
+    # A fresh salt is never looked up again, so this key bypasses the session memo
     salt = _os.urandom(16)
-    key = _derive_key(password, salt, iterations)
+    if hash_secret_raw is not None:
+        params = (
+            int(app_config.get('argon2_time_cost', 3)),
+            int(app_config.get('argon2_memory_cost', 65536)),
+            int(app_config.get('argon2_parallelism', 4)),
+        )
+        key = _derive(ALG_ARGON2ID, password, salt, params)
+        payload = {'enc': True, 'alg': ALG_ARGON2ID, 't': params[0], 'm': params[1], 'p': params[2]}
+    else:
+        key = _derive(ALG_PBKDF2, password, salt, (iterations,))
+        payload = {'enc': True, 'alg': ALG_PBKDF2, 'it': iterations}
     f = Fernet(key)
     token = f.encrypt(plain_text.encode('utf-8'))
-    payload = {
-        'enc': True,
-        'alg': 'fernet-pbkdf2',
-        'it': iterations,
-        'salt': base64.urlsafe_b64encode(salt).decode('ascii'),
-        'ct': token.decode('ascii')
-    }
+    payload['salt'] = salt.hex()
+    payload['ct'] = token.decode('ascii')
+    if orjson is not None:
+        return orjson.dumps(payload).decode('utf-8')
     return json.dumps(payload)
 
 
 def decrypt_content(enc_payload: str, password: str) -> str:
     """Decrypt JSON payload back to plaintext."""
-    if Fernet is None:
-        raise RuntimeError("Encryption support not available. Install 'cryptography'.")
+    Fernet, InvalidToken = _get_fernet()
     data = json.loads(enc_payload)
     if not data.get('enc'):
         return enc_payload
-    salt = base64.urlsafe_b64decode(data['salt'])
-    iterations = int(data.get('it', 390000))
-    key = _derive_key(password, salt, iterations)
+    salt = _decode_salt(data['salt'])
+    alg = data.get('alg', ALG_PBKDF2)
+    if alg == ALG_ARGON2ID:
+        if hash_secret_raw is None:
+            raise RuntimeError("This note uses Argon2id. Install 'argon2-cffi' to unlock it.")
+        params = (int(data['t']), int(data['m']), int(data['p']))
+    else:
+        params = (int(data.get('it', 390000)),)
+    key = _get_key(alg, password, salt, params)
     f = Fernet(key)
     try:
         pt = f.decrypt(data['ct'].encode('ascii'))
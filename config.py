@@ -1,17 +1,40 @@
 """
 Configuration settings for Alem application
 """
+import hashlib
+import json
 import os
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, Any
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dump_settings(settings: Dict[str, Any]) -> bytes:
+    """Serialize settings as indented, key-sorted JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(settings, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+    return json.dumps(settings, indent=2, sort_keys=True).encode('utf-8')
+
+
+def _digest(blob: bytes) -> bytes:
+    return hashlib.blake2b(blob, digest_size=16).digest()
+
+
 # Application constants
 APP_NAME = "Alem"
 APP_VERSION = "1.1.1"
 APP_AUTHOR = "a3ro-dev"
 
-# Default settings
-DEFAULT_SETTINGS = {
+# Default settings; read-only, nested values are tuples/proxies so they can't be mutated through a lookup
+DEFAULT_SETTINGS = MappingProxyType({
     # UI Settings
     "window_width": 1400,
     "window_height": 900,
@@ -45,9 +68,9 @@ DEFAULT_SETTINGS = {
 
     # Markdown / Editor Modes
     "default_content_format": "markdown",  # 'html' or 'markdown'
-    "markdown_extensions": [
+    "markdown_extensions": (
         "fenced_code", "codehilite", "tables", "toc"
-    ],
+    ),
 
     # Redis Cache
     "redis_enabled": True,
@@ -61,15 +84,29 @@ DEFAULT_SETTINGS = {
     "discord_client_id": "1320090449886273606",  # Replace with your actual Discord app client ID
     "discord_large_image": "alem",  # Asset key configured in Discord Dev Portal
     "discord_large_text": "Alem - Smart Notes",
-    "discord_buttons": [
-        {"label": "⭐ GitHub Repo", "url": "https://github.com/a3ro-dev/aAlem"},
-        {"label": "📝 Try Alem", "url": "https://github.com/a3ro-dev/aAlem/releases"}
-    ],
+    "discord_buttons": (
+        MappingProxyType({"label": "⭐ GitHub Repo", "url": "https://github.com/a3ro-dev/aAlem"}),
+        MappingProxyType({"label": "📝 Try Alem", "url": "https://github.com/a3ro-dev/aAlem/releases"}),
+    ),
     "discord_update_interval_s": 15,
 
     # Security (password protection)
-    "kdf_iterations": 390000,
-}
+    "kdf_iterations": 390000,  # PBKDF2 fallback when argon2-cffi is not installed
+    "argon2_time_cost": 3,
+    "argon2_memory_cost": 65536,  # KiB
+    "argon2_parallelism": 4,
+    "kdf_cache_enabled": True,  # keep derived keys in memory for the session
+})
+
+
+def _is_default(key: str, value: Any) -> bool:
+    """Whether value matches the default for key (JSON lists compare equal to tuple defaults)"""
+    if key not in DEFAULT_SETTINGS:
+        return False
+    default = DEFAULT_SETTINGS[key]
+    if isinstance(default, tuple) and isinstance(value, list):
+        return list(default) == value
+    return default == value
 
 # Color themes
 THEMES = {
@@ -89,22 +126,29 @@ THEMES = {
     }
 }
 
+# Resolved once; the directories below are created on first use and then cached
+_HOME = Path.home()
+
+
+@lru_cache(maxsize=1)
 def get_config_dir() -> Path:
     """Get the configuration directory"""
-    config_dir = Path.home() / ".config" / "alem"
+    config_dir = _HOME / ".config" / "alem"
     config_dir.mkdir(parents=True, exist_ok=True)
     return config_dir
 
+@lru_cache(maxsize=1)
 def get_data_dir() -> Path:
     """Get the data directory"""
     if os.name == 'nt':  # Windows
-        data_dir = Path(os.environ.get('APPDATA', Path.home())) / "Alem"
+        data_dir = Path(os.environ.get('APPDATA', _HOME)) / "Alem"
     else:  # Linux/macOS
-        data_dir = Path.home() / ".local" / "share" / "alem"
+        data_dir = _HOME / ".local" / "share" / "alem"
     
     data_dir.mkdir(parents=True, exist_ok=True)
     return data_dir
 
+@lru_cache(maxsize=1)
 def get_log_dir() -> Path:
     """Get the log directory"""
     log_dir = get_data_dir() / "logs"
@@ -115,39 +159,99 @@ class AppConfig:
     """Application configuration manager"""
     
     def __init__(self):
-        self.settings = DEFAULT_SETTINGS.copy()
+        # Only values that differ from DEFAULT_SETTINGS are kept here and written to disk
+        self._user_settings: Dict[str, Any] = {}
+        self.settings = ChainMap(self._user_settings, DEFAULT_SETTINGS)
         self.config_file = get_config_dir() / "settings.json"
+        self._last_hash = None  # digest of the settings as last read from/written to disk
+        self._writer = None  # single-thread executor so background writes land in order
         self.load_config()
     
     def load_config(self):
         """Load configuration from file"""
         if self.config_file.exists():
             try:
-                import json
                 with open(self.config_file, 'r') as f:
                     user_settings = json.load(f)
-                    self.settings.update(user_settings)
+                    self._apply(user_settings)
+                self._last_hash = _digest(_dump_settings(self._user_settings))
             except Exception as e:
                 print(f"Warning: Could not load config: {e}")
     
+    def _pending_snapshot(self):
+        """Serialized settings if they differ from what is on disk, else None"""
+        snapshot = _dump_settings(self._user_settings)
+        digest = _digest(snapshot)
+        if digest == self._last_hash:
+            return None
+        self._last_hash = digest
+        return snapshot
+
+    def _write_snapshot(self, snapshot: bytes):
+        try:
+            # Write a sibling file and swap it in so a crash never leaves half a config
+            tmp_file = self.config_file.with_suffix('.json.tmp')
+            with open(tmp_file, 'wb') as f:
+                f.write(snapshot)
+            os.replace(tmp_file, self.config_file)
+        except Exception as e:
+            self._last_hash = None  # let the next save retry
+            print(f"Warning: Could not save config: {e}")
+
     def save_config(self):
-        """Save configuration to file"""
+        """Save configuration to file, skipping the write when nothing changed"""
         try:
-            import json
-            with open(self.config_file, 'w') as f:
-                json.dump(self.settings, f, indent=2)
+            snapshot = self._pending_snapshot()
         except Exception as e:
             print(f"Warning: Could not save config: {e}")
+            return
+        if snapshot is not None:
+            self._write_snapshot(snapshot)
+
+    def save(self):
+        """Persist in-memory changes made with set()"""
+        self.save_config()
+
+    def save_async(self):
+        """Like save(), but the file write happens on a background thread"""
+        try:
+            snapshot = self._pending_snapshot()
+        except Exception as e:
+            print(f"Warning: Could not save config: {e}")
+            return
+        if snapshot is None:
+            return
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="alem-config")
+        self._writer.submit(self._write_snapshot, snapshot)
     
+    def snapshot(self) -> Dict[str, Any]:
+        """Shallow copy of all settings for bulk reads"""
+        return dict(self.settings)
+
     def get(self, key: str, default=None):
         """Get a configuration value"""
         return self.settings.get(key, default)
     
     def set(self, key: str, value: Any):
-        """Set a configuration value"""
-        self.settings[key] = value
-        self.save_config()
+        """Set a configuration value in memory; call save() to persist"""
+        self._apply({key: value})
+
+    def update(self, mapping: Dict[str, Any], background: bool = False):
+        """Set several configuration values and persist them in one write"""
+        self._apply(mapping)
+        if background:
+            self.save_async()
+        else:
+            self.save_config()
     
+    def _apply(self, mapping: Dict[str, Any]):
+        for key, value in mapping.items():
+            if _is_default(key, value):
+                self._user_settings.pop(key, None)
+            else:
+                self._user_settings[key] = value
+
     def get_theme(self, theme_name: str = None) -> Dict[str, str]:
         """Get theme colors"""
         theme_name = theme_name or self.get("theme", "dark")
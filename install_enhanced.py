@@ -4,13 +4,34 @@ Enhanced Installation Script for Alem 2.0
 Installs all dependencies and sets up the application for optimal performance.
 """
 
+import importlib.util
 import sys
 import subprocess
 import os
 import platform
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import urllib.request
-import json
+
+# platform.system() may shell out to uname, so ask once
+_OS = platform.system()
+
+_HERE = Path(__file__).resolve().parent
+_APP_FILE = _HERE / "Alem.py"
+_ICON_FILE = _HERE / "alem.png"
+
+def _module_available(name):
+    """Whether a module can be found, without executing it (or its heavy dependencies)"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        # A missing parent package raises instead of returning None
+        return False
+
+def _probe_modules(modules):
+    """Map each module name to its availability, probing them concurrently"""
+    modules = list(modules)
+    with ThreadPoolExecutor(max_workers=max(1, len(modules))) as executor:
+        return dict(zip(modules, executor.map(_module_available, modules)))
 
 def print_banner():
     """Print the installation banner"""
@@ -39,8 +60,7 @@ def check_system_requirements():
     print("\n🔍 Checking system requirements...")
     
     # Check OS
-    os_name = platform.system()
-    print(f"   Operating System: {os_name}")
+    print(f"   Operating System: {_OS}")
     
     # Check available memory
     try:
@@ -54,88 +74,116 @@ def check_system_requirements():
     
     print("✅ System requirements check completed")
 
+def _ensure_uv():
+    """Make `python -m uv` available, installing it with pip once if needed"""
+    if importlib.util.find_spec("uv") is not None:
+        return True
+    try:
+        print("   Installing uv...")
+        subprocess.check_call([
+            sys.executable, "-m", "pip", "install", "--quiet", "uv"
+        ])
+    except subprocess.CalledProcessError:
+        print("⚠️  Warning: Could not install uv, falling back to pip")
+        return False
+    importlib.invalidate_caches()
+    return importlib.util.find_spec("uv") is not None
+
 def install_pip_requirements():
     """Install pip requirements"""
     print("\n📦 Installing Python dependencies...")
     
-    requirements_file = Path(__file__).parent / "requirements.txt"
+    requirements_file = _HERE / "requirements.txt"
     if not requirements_file.exists():
         print("❌ Error: requirements.txt not found")
         sys.exit(1)
     
+    # Pinned, pre-resolved versions; regenerate after editing requirements.txt with
+    #   uv pip compile requirements.txt --universal --python-version 3.8 -o requirements.lock
+    lock_file = _HERE / "requirements.lock"
+    
+    # uv resolves and downloads in parallel; plain pip stays as the fallback.
+    # The lock is installed rather than synced so unrelated packages in this interpreter survive.
+    installers = []
+    attempts = []
+    if _ensure_uv():
+        uv_install = [sys.executable, "-m", "uv", "pip", "install", "--python", sys.executable]
+        installers.append(uv_install)
+        if lock_file.exists():
+            attempts.append(uv_install + ["-r", str(lock_file)])
+        attempts.append(uv_install + ["-r", str(requirements_file)])
+    pip_install = [sys.executable, "-m", "pip", "install"]
+    installers.append(pip_install)
+    attempts.append(pip_install + ["-r", str(requirements_file)])
+    
+    for command in attempts:
+        try:
+            print(f"   Installing {Path(command[-1]).name} with {command[2]}...")
+            subprocess.check_call(command)
+            print("✅ Dependencies installed successfully")
+            return
+        except subprocess.CalledProcessError as e:
+            print(f"❌ Error installing dependencies: {e}")
+    
+    print("\n🔧 Trying alternative installation methods...")
+    
+    # Install just the core dependencies, resolved together in one call
+    core_deps = [
+        "PyQt6>=6.6.0",
+        "markdown>=3.5.1",
+        "cryptography>=41.0.0",
+        "psutil>=5.9.0"
+    ]
+    
     try:
-        # Upgrade pip first
-        print("   Upgrading pip...")
-        subprocess.check_call([
-            sys.executable, "-m", "pip", "install", "--upgrade", "pip"
-        ])
-        
-        # Install requirements
-        print("   Installing requirements...")
-        subprocess.check_call([
-            sys.executable, "-m", "pip", "install", "-r", str(requirements_file)
-        ])
-        
-        print("✅ Dependencies installed successfully")
-        
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error installing dependencies: {e}")
-        print("\n🔧 Trying alternative installation methods...")
-        
-        # Try installing core dependencies individually
-        core_deps = [
-            "PyQt6>=6.6.0",
-            "markdown>=3.5.1",
-            "cryptography>=41.0.0",
-            "psutil>=5.9.0"
-        ]
-        
-        for dep in core_deps:
-            try:
-                print(f"   Installing {dep}...")
-                subprocess.check_call([
-                    sys.executable, "-m", "pip", "install", dep
-                ])
-            except subprocess.CalledProcessError:
-                print(f"⚠️  Warning: Could not install {dep}")
-        
+        print(f"   Installing {', '.join(core_deps)}...")
+        subprocess.check_call(installers[0] + core_deps)
         print("✅ Core dependencies installed")
+        return
+    except subprocess.CalledProcessError:
+        print("⚠️  Warning: Could not install core dependencies together")
+    
+    # Last resort: one at a time, so whatever does install is kept and the failure is named
+    for dep in core_deps:
+        try:
+            print(f"   Installing {dep}...")
+            subprocess.check_call(installers[0] + [dep])
+        except subprocess.CalledProcessError:
+            print(f"⚠️  Warning: Could not install {dep}")
 
 def setup_optional_features():
     """Setup optional features"""
     print("\n⚙️ Setting up optional features...")
     
+    found = _probe_modules(["redis", "pypresence", "PyQt6.QtWebEngineWidgets", "transformers"])
+    
     # Redis setup
-    try:
-        import redis
+    if found["redis"]:
         print("✅ Redis client available - caching enabled")
-    except ImportError:
+    else:
         print("⚠️  Redis not available - install Redis server for caching")
     
     # Discord RPC setup
-    try:
-        import pypresence
+    if found["pypresence"]:
         print("✅ Discord RPC available - rich presence enabled")
-    except ImportError:
+    else:
         print("⚠️  Discord RPC not available")
     
     # WebEngine setup
-    try:
-        from PyQt6.QtWebEngineWidgets import QWebEngineView
+    if found["PyQt6.QtWebEngineWidgets"]:
         print("✅ WebEngine available - enhanced preview enabled")
-    except ImportError:
+    else:
         print("⚠️  WebEngine not available - using fallback preview")
     
     # AI features setup
-    try:
-        import transformers
+    if found["transformers"]:
         print("✅ AI features available - semantic search enabled")
-    except ImportError:
+    else:
         print("⚠️  AI features not available - using text search only")
 
 def create_desktop_shortcut():
     """Create desktop shortcut (Windows only)"""
-    if platform.system() != "Windows":
+    if _OS != "Windows":
         return
         
     print("\n🔗 Creating desktop shortcut...")
@@ -147,8 +195,8 @@ def create_desktop_shortcut():
         desktop = winshell.desktop()
         shortcut_path = os.path.join(desktop, "Alem.lnk")
         target = sys.executable
-        arguments = str(Path(__file__).parent / "Alem.py")
-        icon_path = Path(__file__).parent / "alem.png"
+        arguments = str(_APP_FILE)
+        icon_path = _ICON_FILE
         
         # Verify icon exists
         if not icon_path.exists():
@@ -161,7 +209,7 @@ def create_desktop_shortcut():
         shortcut = shell.CreateShortCut(shortcut_path)
         shortcut.Targetpath = target
         shortcut.Arguments = arguments
-        shortcut.WorkingDirectory = str(Path(__file__).parent)
+        shortcut.WorkingDirectory = str(_HERE)
         if icon:
             shortcut.IconLocation = icon
         shortcut.save()
@@ -172,23 +220,32 @@ def create_desktop_shortcut():
     except Exception as e:
         print(f"⚠️  Could not create desktop shortcut: {e}")
 
-def verify_installation():
-    """Verify the installation"""
+# Imported for real by the default verify: find_spec alone cannot tell that Qt's native libraries load
+_CORE_IMPORTS = ("PyQt6.QtCore", "PyQt6.QtWidgets", "markdown")
+
+def verify_imports_only():
+    """Import the core modules in a fresh interpreter, without starting the application"""
     print("\n🧪 Verifying installation...")
     
+    print("   Testing imports...")
+    # A child interpreter sees packages installed by this run and keeps Qt out of the installer
+    result = subprocess.run(
+        [sys.executable, "-c", "import " + ", ".join(_CORE_IMPORTS)],
+        capture_output=True, text=True, timeout=60
+    )
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()
+        print(f"⚠️  Verification failed: {error[-1] if error else 'core imports failed'}")
+        return False
+    print("✅ Core imports successful")
+    return True
+
+def verify_full_startup():
+    """Start the application in test mode (opt-in with --full-verify)"""
     try:
-        # Test import
-        print("   Testing imports...")
-        from PyQt6.QtWidgets import QApplication
-        from PyQt6.QtCore import Qt
-        import markdown
-        print("✅ Core imports successful")
-        
-        # Test application startup
         print("   Testing application startup...")
-        import subprocess
         result = subprocess.run([
-            sys.executable, str(Path(__file__).parent / "Alem.py"), "--test"
+            sys.executable, str(_APP_FILE), "--test"
         ], capture_output=True, timeout=10)
         
         if result.returncode == 0:
@@ -218,7 +275,8 @@ def setup_discord_rpc():
 
 def main():
     """Main installation function"""
-    print_banner()
+    if "--quiet" not in sys.argv:
+        print_banner()
     
     try:
         check_python_version()
@@ -226,18 +284,19 @@ def main():
         install_pip_requirements()
         setup_optional_features()
         
-        if platform.system() == "Windows":
+        if _OS == "Windows":
             create_desktop_shortcut()
         
-        verify_installation()
+        if verify_imports_only() and "--full-verify" in sys.argv:
+            verify_full_startup()
         setup_discord_rpc()
         
         print("\n" + "="*60)
         print("🎉 Installation completed successfully!")
         print("\nTo start Alem:")
-        print(f"   python {Path(__file__).parent / 'Alem.py'}")
+        print(f"   python {_APP_FILE}")
         print("\nOr use the launcher:")
-        print(f"   python {Path(__file__).parent / 'launch_enhanced.py'}")
+        print(f"   python {_HERE / 'launch_enhanced.py'}")
         print("\nEnjoy your enhanced note-taking experience! 🌟")
         print("="*60)
         
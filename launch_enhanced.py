@@ -4,26 +4,123 @@ Enhanced Launcher for Alem 2.0
 Provides startup diagnostics, performance monitoring, and environment checks.
 """
 
+import hashlib
+import importlib.util
+import json
 import sys
 import os
-import time
-import subprocess
+import sysconfig
 from pathlib import Path
-import logging
-from datetime import datetime
+
+_HERE = Path(__file__).resolve().parent
+_APP_FILE = _HERE / "Alem.py"
+_ICON_FILE = _HERE / "alem.png"
+
+def _module_available(name):
+    """Whether a module can be found, without executing it (or its heavy dependencies)"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        # A missing parent package raises instead of returning None
+        return False
+
+def _probe_modules(modules):
+    """Map each module name to its availability, probing them concurrently"""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    modules = list(modules)
+    with ThreadPoolExecutor(max_workers=max(1, len(modules))) as executor:
+        return dict(zip(modules, executor.map(_module_available, modules)))
+
+ENV_CACHE_FILE = Path.home() / ".alem" / "launcher_cache.json"
+
+def environment_cache_key():
+    """Fingerprint of the interpreter and its installed packages"""
+    import site
+    
+    parts = [sys.version]
+    paths = [sys.executable, sysconfig.get_paths()["purelib"]]
+    # The app also imports from the user site unless it is switched off for this launch
+    if site.ENABLE_USER_SITE and not os.environ.get("PYTHONNOUSERSITE"):
+        paths.append(site.getusersitepackages())
+    for path in paths:
+        try:
+            parts.append(str(os.path.getmtime(path)))
+        except OSError:
+            parts.append("missing")
+    return hashlib.blake2b("|".join(parts).encode(), digest_size=16).hexdigest()
+
+def read_launcher_cache():
+    """Everything the launcher cached on earlier runs (empty if missing or unreadable)"""
+    try:
+        with open(ENV_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cached if isinstance(cached, dict) else {}
+
+def write_launcher_cache(cached):
+    """Atomically replace the launcher cache file"""
+    try:
+        ENV_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = ENV_CACHE_FILE.with_suffix(".json.tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(cached, f)
+        os.replace(tmp_file, ENV_CACHE_FILE)
+    except OSError:
+        pass
+
+def load_environment_cache(key):
+    """Available features from the last clean environment check, if it is still valid"""
+    cached = read_launcher_cache()
+    if cached.get("key") != key:
+        return None
+    return cached.get("available_features", [])
+
+def save_environment_cache(key, available_features):
+    """Remember a clean environment check for the next launch"""
+    write_launcher_cache({"key": key, "available_features": available_features})
+
+# Anything installed into the user site: a distribution's metadata, or a .pth (editable installs)
+_USER_SITE_MARKERS = (".dist-info", ".egg-info", ".pth")
+
+def user_site_needed():
+    """Whether anything has been installed into the per-user site-packages (pip --user)
+
+    Probing only the app's own packages is not enough: a package from the main site-packages
+    may still import a dependency that only exists in the user site.
+    """
+    import site
+    
+    if not site.ENABLE_USER_SITE:
+        return False
+    try:
+        with os.scandir(site.getusersitepackages()) as entries:
+            return any(entry.name.endswith(_USER_SITE_MARKERS) for entry in entries)
+    except OSError:
+        return False
 
 def setup_logging():
     """Setup logging for the launcher"""
+    import logging
+    from datetime import datetime
+    from logging.handlers import MemoryHandler
+    
     log_dir = Path.home() / ".alem" / "logs"
     log_dir.mkdir(parents=True, exist_ok=True)
     
     log_file = log_dir / f"alem_launcher_{datetime.now().strftime('%Y%m%d')}.log"
     
+    log_format = '%(asctime)s - %(levelname)s - %(message)s'
+    file_handler = logging.FileHandler(str(log_file), encoding='utf-8', delay=True)
+    file_handler.setFormatter(logging.Formatter(log_format))
+    
+    # Buffer routine records and write the file in one go (on errors, before exec, or at exit)
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
+        format=log_format,
         handlers=[
-            logging.FileHandler(str(log_file), encoding='utf-8'),
+            MemoryHandler(1000, flushLevel=logging.ERROR, target=file_handler),
             logging.StreamHandler()
         ]
     )
@@ -42,9 +139,11 @@ def print_startup_banner():
     """
     print(banner)
 
-def check_environment(logger):
+def check_environment(logger, quiet=False):
     """Check the environment before launching"""
     logger.info("🔍 Performing environment checks...")
+    # Per-dependency success lines only show up in the log when not quiet
+    log_ok = logger.debug if quiet else logger.info
     
     issues = []
     
@@ -52,7 +151,7 @@ def check_environment(logger):
     if sys.version_info < (3, 8):
         issues.append(f"Python {sys.version} is too old. Requires 3.8+")
     else:
-        logger.info(f"[OK] Python {sys.version_info.major}.{sys.version_info.minor} detected")
+        log_ok(f"[OK] Python {sys.version_info.major}.{sys.version_info.minor} detected")
     
     # Check critical dependencies
     critical_deps = {
@@ -61,14 +160,6 @@ def check_environment(logger):
         'cryptography': 'cryptography',
     }
     
-    for name, module in critical_deps.items():
-        try:
-            __import__(module)
-            logger.info(f"[OK] {name} available")
-        except ImportError:
-            issues.append(f"Missing critical dependency: {name}")
-    
-    # Check optional dependencies
     optional_deps = {
         'Redis': 'redis',
         'Discord RPC': 'pypresence',
@@ -77,109 +168,127 @@ def check_environment(logger):
         'AI Features': 'transformers'
     }
     
+    # Stat the import path for every dependency at once rather than one after another
+    found = _probe_modules([*critical_deps.values(), *optional_deps.values()])
+    
+    for name, module in critical_deps.items():
+        if found[module]:
+            log_ok(f"[OK] {name} available")
+        else:
+            issues.append(f"Missing critical dependency: {name}")
+    
+    # Check optional dependencies
     available_features = []
     for name, module in optional_deps.items():
-        try:
-            __import__(module)
+        if found[module]:
             available_features.append(name)
-            logger.info(f"[OK] {name} available")
-        except ImportError:
+            log_ok(f"[OK] {name} available")
+        else:
             logger.info(f"[WARN] {name} not available")
     
+    return issues, available_features
+
+def check_app_files(logger):
+    """Check the app's own files; cheap enough to run even when the environment check is cached"""
+    issues = []
+    
     # Check for Alem.py
-    app_file = Path(__file__).parent / "Alem.py"
-    if not app_file.exists():
+    if not _APP_FILE.exists():
         issues.append("Alem.py not found in the same directory")
     else:
         logger.info("[OK] Alem.py found")
     
     # Check for app icon
-    icon_file = Path(__file__).parent / "alem.png"
-    if not icon_file.exists():
+    if not _ICON_FILE.exists():
         logger.warning("[WARN] App icon (alem.png) not found - will use default icon")
     else:
         logger.info("[OK] App icon found")
     
-    return issues, available_features
+    return issues
+
+def read_meminfo():
+    """(available, total) RAM in bytes from /proc/meminfo, or None off Linux"""
+    try:
+        with open('/proc/meminfo', 'r') as f:
+            fields = dict(line.split(':', 1) for line in f)
+        # Values are reported in kB
+        return int(fields['MemAvailable'].split()[0]) * 1024, int(fields['MemTotal'].split()[0]) * 1024
+    except (OSError, KeyError, ValueError):
+        return None
 
 def check_system_resources(logger):
     """Check system resources"""
     logger.info("[INFO] Checking system resources...")
     
-    try:
+    # Linux answers from stdlib; other platforms need psutil
+    memory = read_meminfo()
+    if memory is not None and hasattr(os, 'statvfs'):
+        st = os.statvfs(str(Path.home()))
+        disk_free = st.f_bavail * st.f_frsize
+    elif _module_available('psutil'):
         import psutil
-        
-        # Memory check
-        memory = psutil.virtual_memory()
-        memory_gb = memory.total / (1024**3)
-        memory_available_gb = memory.available / (1024**3)
-        
-        logger.info(f"   RAM: {memory_available_gb:.1f}GB available of {memory_gb:.1f}GB total")
-        
-        if memory_available_gb < 1:
-            logger.warning("[WARN] Low memory warning: Less than 1GB available")
-        
-        # Disk check
-        disk = psutil.disk_usage(str(Path.home()))
-        disk_free_gb = disk.free / (1024**3)
-        
-        logger.info(f"   Disk: {disk_free_gb:.1f}GB free space")
-        
-        if disk_free_gb < 1:
-            logger.warning("[WARN] Low disk space warning: Less than 1GB free")
-        
-        # CPU check
-        cpu_count = psutil.cpu_count()
-        logger.info(f"   CPU: {cpu_count} cores")
-        
-    except ImportError:
+        vm = psutil.virtual_memory()
+        memory = (vm.available, vm.total)
+        disk_free = psutil.disk_usage(str(Path.home())).free
+    else:
         logger.info("   Resource monitoring not available (psutil not installed)")
+        return
+    
+    # Memory check
+    memory_available_gb, memory_gb = (value / (1024**3) for value in memory)
+    
+    logger.info(f"   RAM: {memory_available_gb:.1f}GB available of {memory_gb:.1f}GB total")
+    
+    if memory_available_gb < 1:
+        logger.warning("[WARN] Low memory warning: Less than 1GB available")
+    
+    # Disk check
+    disk_free_gb = disk_free / (1024**3)
+    
+    logger.info(f"   Disk: {disk_free_gb:.1f}GB free space")
+    
+    if disk_free_gb < 1:
+        logger.warning("[WARN] Low disk space warning: Less than 1GB free")
+    
+    # CPU check
+    logger.info(f"   CPU: {os.cpu_count()} cores")
 
 def check_redis_connection(logger):
     """Check Redis connection if available"""
+    import socket
+    
+    logger.info("[INFO] Checking Redis connection...")
+    
+    # A refused or silent port answers in milliseconds; only talk Redis once something is listening
+    try:
+        with socket.create_connection(("127.0.0.1", 6379), timeout=0.1):
+            pass
+    except OSError:
+        logger.info("[WARN] Redis server not running - caching disabled")
+        return False
+    
     try:
         import redis
-        
-        logger.info("[INFO] Checking Redis connection...")
-        
-        try:
-            r = redis.Redis(host='localhost', port=6379, db=0, socket_timeout=2)
-            r.ping()
-            logger.info("[OK] Redis server is running - caching enabled")
-            return True
-        except (redis.ConnectionError, redis.TimeoutError):
-            logger.info("[WARN] Redis server not running - caching disabled")
-            return False
     except ImportError:
         logger.info("[WARN] Redis client not available")
         return False
+    
+    try:
+        r = redis.Redis(host='127.0.0.1', port=6379, db=0, socket_timeout=2)
+        r.ping()
+        logger.info("[OK] Redis server is running - caching enabled")
+        return True
+    except Exception:
+        # Refused, timed out, or whatever is on the port doesn't speak Redis
+        logger.info("[WARN] Redis server not running - caching disabled")
+        return False
 
 def verify_recent_fixes(logger):
     """Verify that recent fixes are working properly"""
     logger.info("[INFO] Verifying recent fixes...")
     
-    # Check if we can import the main app
-    try:
-        import importlib.util
-        app_file = Path(__file__).parent / "Alem.py"
-        spec = importlib.util.spec_from_file_location("Alem", app_file)
-        alem_module = importlib.util.module_from_spec(spec)
-        
-        # Check for key classes and methods
-        if hasattr(alem_module, 'SmartNotesApp'):
-            logger.info("[OK] Main application class found")
-        else:
-            logger.warning("[WARN] Main application class not found")
-            
-        if hasattr(alem_module, 'Database'):
-            logger.info("[OK] Database class found")
-        else:
-            logger.warning("[WARN] Database class not found")
-            
-        logger.info("[OK] Application structure verified")
-        
-    except Exception as e:
-        logger.warning(f"[WARN] Could not verify application structure: {e}")
+    # Import problems in the app surface through its exit code at launch
+    # (or ahead of time with: python Alem.py --self-check)
     
     # Check for common issues
     logger.info("[OK] Window resizing and snapping should work properly")
@@ -189,20 +298,41 @@ def verify_recent_fixes(logger):
 
 def launch_application(logger, debug_mode=False):
     """Launch the main application"""
-    logger.info("[INFO] Starting Alem application...")
+    import logging
+    import subprocess
+    import time
     
-    app_file = Path(__file__).parent / "Alem.py"
+    logger.info("[INFO] Starting Alem application...")
     
     # Prepare launch arguments
-    args = [sys.executable, str(app_file)]
+    args = [sys.executable, str(_APP_FILE)]
     
     if debug_mode:
         args.append("--debug")
     
-    # Set environment variables for better performance
-    env = os.environ.copy()
-    env['QT_AUTO_SCREEN_SCALE_FACTOR'] = '1'
-    env['QT_ENABLE_HIGHDPI_SCALING'] = '1'
+    # Set environment variables for better performance; the launcher is about to hand over
+    # to the app, so they go straight into its own environment for the app to inherit
+    os.environ['QT_AUTO_SCREEN_SCALE_FACTOR'] = '1'
+    os.environ['QT_ENABLE_HIGHDPI_SCALING'] = '1'
+    # Skip user site-packages processing (.pth files, usercustomize) unless the app lives there.
+    # -S is not an option: it drops the main site-packages where PyQt6 is installed.
+    if not user_site_needed():
+        os.environ['PYTHONNOUSERSITE'] = '1'
+    
+    if os.name != 'nt':
+        # Become the application rather than waiting on it as a parent process.
+        # Windows emulates exec by spawning and exiting, so it keeps the child path below.
+        logger.info("[INFO] Handing over to the application process")
+        # exec skips atexit, so write out buffered log records now
+        for handler in logging.getLogger().handlers:
+            handler.flush()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        try:
+            os.chdir(_HERE)
+            os.execv(sys.executable, args)
+        except OSError as e:
+            logger.warning(f"[WARN] Could not exec application ({e}) - starting it as a child process")
     
     try:
         # Launch with performance monitoring
@@ -210,8 +340,7 @@ def launch_application(logger, debug_mode=False):
         
         process = subprocess.Popen(
             args,
-            env=env,
-            cwd=Path(__file__).parent
+            cwd=_HERE
         )
         
         # Wait a moment to check if app started successfully
@@ -274,15 +403,27 @@ def show_performance_summary(logger, available_features, redis_available):
 
 def main():
     """Main launcher function"""
-    print_startup_banner()
+    quiet = "--quiet" in sys.argv
+    if not quiet:
+        print_startup_banner()
     
     # Setup logging
     logger = setup_logging()
     logger.info("Alem 2.0 Launcher started")
     
     try:
-        # Environment checks
-        issues, available_features = check_environment(logger)
+        issues = check_app_files(logger)
+        
+        # Environment checks are skipped while the interpreter and site-packages are unchanged
+        cache_key = environment_cache_key()
+        available_features = None if "--no-cache" in sys.argv else load_environment_cache(cache_key)
+        cached = available_features is not None
+        
+        if cached:
+            logger.info("[OK] Environment unchanged since last check - skipping checks (--no-cache to force)")
+        else:
+            env_issues, available_features = check_environment(logger, quiet=quiet)
+            issues.extend(env_issues)
         
         if issues:
             print("\n[ERROR] CRITICAL ISSUES FOUND:")
@@ -292,17 +433,21 @@ def main():
             print("   python install_enhanced.py")
             return 1
         
-        # System resource checks
-        check_system_resources(logger)
+        if not cached:
+            # System resource checks
+            check_system_resources(logger)
+            
+            # Verify recent fixes
+            verify_recent_fixes(logger)
+            
+            save_environment_cache(cache_key, available_features)
         
         # Redis connection check
         redis_available = check_redis_connection(logger)
         
-        # Verify recent fixes
-        verify_recent_fixes(logger)
-        
         # Show performance summary
-        show_performance_summary(logger, available_features, redis_available)
+        if not quiet:
+            show_performance_summary(logger, available_features, redis_available)
         
         # Launch application
         print("\n[INFO] Launching Alem...")